@@ -0,0 +1,73 @@
+# alimentar_qdrant.py
+# Um único comando para semear o Qdrant a partir dos datasets em dados/*.json:
+#   python alimentar_qdrant.py                      # todos os datasets
+#   python alimentar_qdrant.py dados/futebol.json   # só alguns
+#   python alimentar_qdrant.py --recriar            # apaga e recria a coleção antes
+#   python alimentar_qdrant.py --processos 4        # codifica em 4 processos
+#   python alimentar_qdrant.py --reindexar          # volta a codificar toda a coleção
+import os
+import glob
+import argparse
+
+from cache_embeddings import CacheEmbeddings
+from colecoes import garantir_colecao, recriar_colecao
+from codificador_multiprocesso import CodificadorMultiprocesso
+from ingestao import carregar_dataset, ingerir, reindexar
+from recursos import obter_cliente
+
+QDRANT_PATH = "qdrant_data"
+QDRANT_URL = os.environ.get("QDRANT_URL")
+COLLECTION_NAME = "chatbot_passagem_ano"
+MODEL_NAME = os.environ.get("CHATBOT_MODELO", "intfloat/multilingual-e5-base")
+VECTOR_SIZE = int(os.environ.get("CHATBOT_DIM", 768))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Semeia o Qdrant com os datasets declarados em dados/.")
+    parser.add_argument("datasets", nargs="*", help="ficheiros de dataset (omissão: dados/*.json)")
+    parser.add_argument("--recriar", action="store_true", help="apaga e recria a coleção antes de semear")
+    parser.add_argument("--lote", type=int, help="pares por lote de encode/upsert (64, ou 256 por processo)")
+    parser.add_argument("--processos", type=int, default=1, help="processos de codificação (0 = todos os cores)")
+    parser.add_argument("--reindexar", action="store_true", help="volta a codificar todos os pontos existentes")
+    args = parser.parse_args()
+
+    paths = args.datasets or sorted(glob.glob(os.path.join("dados", "*.json")))
+    datasets = [carregar_dataset(p) for p in paths]
+
+    os.makedirs(QDRANT_PATH, exist_ok=True)
+    codificador = CodificadorMultiprocesso(MODEL_NAME, processos=args.processos or None)
+    lote = args.lote or 64 * (1 if codificador.processos == 1 else 4 * codificador.processos)
+    client = obter_cliente(QDRANT_PATH, url=QDRANT_URL)
+    cache = CacheEmbeddings()
+
+    if args.recriar:
+        print(f"⚠️ A apagar e recriar a coleção '{COLLECTION_NAME}'…")
+        recriar_colecao(client, COLLECTION_NAME, VECTOR_SIZE)
+    else:
+        garantir_colecao(client, COLLECTION_NAME, VECTOR_SIZE)
+
+    def codificar_lote(perguntas):
+        return cache.codificar(MODEL_NAME, perguntas, codificador.codificar, batch_size=64)
+
+    try:
+        if args.reindexar:
+            # Sem cache: o objetivo é mesmo recalcular os vetores
+            stats = reindexar(client, COLLECTION_NAME, lambda p: codificador.codificar(p, batch_size=64), tamanho_lote=lote)
+            stats["erros"] = 0
+            print(f"🔁 Recodificados {stats['pares']} pontos em {stats['segundos']:.1f}s ({stats['pares_por_segundo']:.0f} pares/s)")
+        else:
+            stats = ingerir(datasets, client, COLLECTION_NAME, codificar_lote, tamanho_lote=lote)
+            print(
+                f"✅ {stats['pares']} pares → {stats['pontos']} pontos na coleção '{COLLECTION_NAME}' em {stats['segundos']:.1f}s "
+                f"({stats['pares_por_segundo']:.0f} pares/s; {stats['segundos_a_codificar']:.1f}s a codificar)"
+            )
+    finally:
+        codificador.fechar()
+        cache.gravar()
+
+    if stats["erros"]:
+        print(f"❌ {stats['erros']} lotes falharam no upsert.")
+
+
+if __name__ == "__main__":
+    main()
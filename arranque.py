@@ -0,0 +1,48 @@
+# arranque.py
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# =====================================================
+# 🚀 ARRANQUE POR ETAPAS EM SEGUNDO PLANO
+# =====================================================
+class Arranque:
+    """
+    Corre as etapas de arranque em paralelo numa thread pool. Cada etapa pode
+    depender de outras; quem precisa do resultado chama `obter(nome)` e só
+    bloqueia nessa etapa (e nas suas dependências). Os tempos de cada etapa
+    ficam em `tempos` e são escritos na consola.
+    """
+
+    def __init__(self, max_workers=8):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="arranque")
+        self._etapas = {}
+        self._lock = threading.Lock()
+        self.inicio = time.perf_counter()
+        self.tempos = {}
+
+    def iniciar(self, nome, fn, depende=()):
+        """Agenda a etapa `nome` (idempotente)."""
+        with self._lock:
+            if nome not in self._etapas:
+                self._etapas[nome] = self._pool.submit(self._executar, nome, fn, tuple(depende))
+        return self._etapas[nome]
+
+    def _executar(self, nome, fn, depende):
+        argumentos = [self.obter(d) for d in depende]
+        t0 = time.perf_counter()
+        try:
+            return fn(*argumentos)
+        finally:
+            fim = time.perf_counter()
+            self.tempos[nome] = (fim - t0) * 1000
+            print(f"⏱️ Arranque '{nome}': {self.tempos[nome]:.0f} ms (pronto aos {(fim - self.inicio) * 1000:.0f} ms)")
+
+    def obter(self, nome):
+        """Resultado da etapa; bloqueia até estar pronta (e propaga o erro se falhou)."""
+        return self._etapas[nome].result()
+
+    def pronto(self, *nomes):
+        """True se todas as etapas indicadas já terminaram."""
+        return all(n in self._etapas and self._etapas[n].done() for n in nomes)
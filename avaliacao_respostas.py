@@ -0,0 +1,181 @@
+# avaliacao_respostas.py
+# Avaliação e latência da cadeia de resposta, sem Streamlit, sobre a coleção
+# já semeada (python alimentar_qdrant.py). O corpus são as perguntas dos
+# datasets de dados/ mais as paráfrases de avaliacao_parafrases.json.
+#   python avaliacao_respostas.py
+#   python avaliacao_respostas.py --limite-conf 0.6 --top-k 5 --limiar-intencao 0.45 --json avaliacao.json
+# Nada é escrito na base (responder(..., registar=False)), e as caches de
+# embeddings e de resultados ficam desligadas: cada item mede o encode e a
+# pesquisa a sério, mesmo que o corpus (ou uma corrida anterior) se repita.
+# A cadeia completa corre sem o índice exato (senão as sementes só mediam um
+# lookup num dict); a etapa "exata" mede-o à parte.
+import os
+import glob
+import json
+import time
+import random
+import argparse
+from collections import Counter, defaultdict
+
+import numpy as np
+
+import learning_qdrant as lq
+from cache_embeddings import CacheEmbeddings
+from cache_resultados import CacheResultados
+from ingestao import agrupar, carregar_dataset, pares_do_dataset
+from motor_respostas import LIMITE_CONF, TOP_K, carregar_evento, carregar_json, responder
+from normalizacao import normalizar
+
+PERFIL_AVALIACAO = {"nome": "Avaliação", "personalidade": "neutro"}
+ETAPAS = ["exata", "codificar", "intencao", "semantica", "gerar_resposta"]
+
+
+# =====================================================
+# 📚 CORPUS ROTULADO
+# =====================================================
+def carregar_corpus(path_parafrases="avaliacao_parafrases.json"):
+    """Itens {pergunta, contexto, respostas esperadas, origem}."""
+    pares = []
+    for path in sorted(glob.glob(os.path.join("dados", "*.json"))):
+        pares.extend(pares_do_dataset(carregar_dataset(path)))
+    corpus, por_pergunta = [], defaultdict(dict)
+    for _, pergunta, respostas, ctx in agrupar(pares):
+        corpus.append({"pergunta": pergunta, "contexto": ctx, "respostas": set(respostas), "origem": "semente"})
+        por_pergunta[pergunta][ctx] = set(respostas)
+
+    for item in carregar_json(path_parafrases, default={}).get("itens", []):
+        grupos = por_pergunta.get(normalizar(item["original"]), {})
+        respostas = (grupos.get(item["contexto"]) or set().union(*grupos.values())) if grupos else set()
+        if not respostas:
+            print(f"⚠️ Paráfrase sem pergunta original semeada: '{item['original']}'")
+        corpus.append({"pergunta": item["pergunta"], "contexto": item["contexto"], "respostas": respostas, "origem": "parafrase"})
+    return corpus
+
+
+def percentis(tempos):
+    if not tempos:
+        return None
+    p50, p95, p99 = np.percentile(tempos, [50, 95, 99])
+    return {"n": len(tempos), "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99)}
+
+
+def medir(tempos, etapa, fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    resultado = fn(*args, **kwargs)
+    tempos[etapa].append((time.perf_counter() - t0) * 1000)
+    return resultado
+
+
+# =====================================================
+# 🧪 AVALIAÇÃO
+# =====================================================
+def avaliar(corpus, event, limite_conf=LIMITE_CONF, top_k=TOP_K):
+    nomes_intencoes = set(lq._motor_intencoes().nomes)
+    tempos = defaultdict(list)
+    por_origem = defaultdict(lambda: {
+        "n": 0, "intencao_n": 0, "intencao_certas": 0, "precisao_soma": 0.0, "precisao_contexto_soma": 0.0,
+        "top1_certas": 0, "resposta_certas": 0, "ramos": Counter(),
+    })
+
+    for item in corpus:
+        m = por_origem[item["origem"]]
+        m["n"] += 1
+        pergunta_l = normalizar(item["pergunta"])
+
+        medir(tempos, "exata", lq.procurar_resposta_exata, pergunta_l)
+        vetor = medir(tempos, "codificar", lq.codificar, pergunta_l)
+        intencao = medir(tempos, "intencao", lq.identificar_intencao, pergunta_l, vetor=vetor)
+        resultados = medir(tempos, "semantica", lq.procurar_semelhantes, pergunta_l, intencao=intencao, top_k=top_k, vetor=vetor)
+
+        # Intenção: só conta onde o rótulo é uma das intenções conhecidas
+        if item["contexto"] in nomes_intencoes:
+            m["intencao_n"] += 1
+            m["intencao_certas"] += intencao == item["contexto"]
+
+        # precision@k: fração do top-k com uma das respostas esperadas (posições vazias contam como erro)
+        m["precisao_soma"] += sum(
+            bool(item["respostas"] & set(lq.respostas_do_payload(p or {}))) for _, p in resultados
+        ) / top_k
+        # Precisão de contexto: fração do top-k com o contexto certo
+        m["precisao_contexto_soma"] += sum((p or {}).get("contexto") == item["contexto"] for _, p in resultados) / top_k
+        if resultados and item["respostas"] & set(lq.respostas_do_payload(resultados[0][1])):
+            m["top1_certas"] += 1
+
+        # Sem o índice exato: a cadeia tem de chegar à resposta pela pesquisa
+        indice_exato, lq.indice_exato = lq.indice_exato, {}
+        try:
+            resposta, _, ramo = medir(
+                tempos, "gerar_resposta", responder, item["pergunta"], PERFIL_AVALIACAO, {}, event,
+                limite_conf=limite_conf, top_k=top_k, registar=False,
+            )
+        finally:
+            lq.indice_exato = indice_exato
+        m["ramos"][ramo] += 1
+        m["resposta_certas"] += resposta in item["respostas"]
+
+    qualidade = {}
+    for origem, m in por_origem.items():
+        qualidade[origem] = {
+            "n": m["n"],
+            "intencao_accuracy": m["intencao_certas"] / m["intencao_n"] if m["intencao_n"] else None,
+            "intencao_n": m["intencao_n"],
+            f"precision_at_{top_k}": m["precisao_soma"] / m["n"],
+            f"precisao_contexto_at_{top_k}": m["precisao_contexto_soma"] / m["n"],
+            "top1_resposta_certa": m["top1_certas"] / m["n"],
+            "resposta_final_certa": m["resposta_certas"] / m["n"],
+            "ramos": dict(m["ramos"]),
+        }
+    return {"latencia": {e: percentis(tempos[e]) for e in ETAPAS}, "qualidade": qualidade}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Avalia intenção, pesquisa e a cadeia completa de resposta.")
+    parser.add_argument("--limite-conf", type=float, default=LIMITE_CONF)
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    parser.add_argument("--limiar-intencao", type=float, help="limiar de 'geral' do motor de intenções")
+    parser.add_argument("--parafrases", default="avaliacao_parafrases.json")
+    parser.add_argument("--json", help="grava o relatório neste ficheiro (omissão: só na consola)")
+    args = parser.parse_args()
+
+    random.seed(0)
+    # Sem caches: senão "codificar", "semantica" e "gerar_resposta" mediriam acertos na cache
+    lq.cache_embeddings = CacheEmbeddings(capacidade=0)
+    lq.cache_resultados = CacheResultados(capacidade=0)
+    corpus = carregar_corpus(args.parafrases)
+    lq.esperar_arranque()
+    if not lq.indice_exato:
+        print("⚠️ A coleção parece vazia — corre primeiro `python alimentar_qdrant.py`.")
+    if args.limiar_intencao is not None:
+        lq._motor_intencoes().limiar = args.limiar_intencao
+
+    # Aquecimento (primeiro encode, caches do numpy) fora das medições
+    lq.procurar_semelhantes("olá", vetor=lq.codificar("olá"))
+
+    relatorio = avaliar(corpus, carregar_evento(), limite_conf=args.limite_conf, top_k=args.top_k)
+    relatorio["parametros"] = {
+        "limite_conf": args.limite_conf,
+        "top_k": args.top_k,
+        "limiar_intencao": lq._motor_intencoes().limiar,
+        "modelo": lq.MODEL_NAME,
+        "corpus": len(corpus),
+    }
+
+    print(f"\n{'etapa':>15} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for etapa, p in relatorio["latencia"].items():
+        if p:
+            print(f"{etapa:>15} {p['p50_ms']:>8.2f} {p['p95_ms']:>8.2f} {p['p99_ms']:>8.2f}")
+    for origem, q in relatorio["qualidade"].items():
+        acc = "—" if q["intencao_accuracy"] is None else f"{q['intencao_accuracy']:.2f}"
+        print(f"\n📊 {origem} ({q['n']}): intenção {acc} · precision@{args.top_k} {q[f'precision_at_{args.top_k}']:.2f} · "
+              f"contexto@{args.top_k} {q[f'precisao_contexto_at_{args.top_k}']:.2f} · "
+              f"top-1 {q['top1_resposta_certa']:.2f} · resposta final {q['resposta_final_certa']:.2f}")
+        print(f"   ramos: {q['ramos']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Relatório em {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# avaliar_perfis.py
+# Recall@k vs latência de cada perfil de coleção (colecoes.PERFIS) sobre as
+# perguntas semeadas em dados/. A verdade de referência é a pesquisa exata
+# (sem HNSW nem quantização) na mesma coleção.
+#   QDRANT_URL=http://localhost:6333 python avaliar_perfis.py
+#   python avaliar_perfis.py --extra 200000 --k 3 --json perfis.json
+# As consultas são as perguntas semeadas com uma palavra a menos, filtradas
+# pelo contexto como na app. `--extra` junta pontos vizinhos dos semeados para
+# simular um histórico grande (o HNSW só é construído acima do limiar de
+# indexação do servidor). No modo local todos os perfis fazem pesquisa exata.
+import os
+import glob
+import json
+import time
+import argparse
+
+import numpy as np
+from qdrant_client import models
+
+from cache_embeddings import CacheEmbeddings
+from colecoes import PERFIS, criar_colecao, modo_local, parametros_pesquisa
+from ingestao import agrupar, carregar_dataset, em_lotes, pares_do_dataset
+from motor_intencoes import normalizar_linhas
+from recursos import obter_cliente, obter_modelo
+
+QDRANT_PATH = "qdrant_benchmark"
+QDRANT_URL = os.environ.get("QDRANT_URL")
+MODEL_NAME = os.environ.get("CHATBOT_MODELO", "intfloat/multilingual-e5-base")
+EXATA = models.SearchParams(exact=True, quantization=models.QuantizationSearchParams(ignore=True))
+
+
+def perguntas_semeadas():
+    pares = []
+    for path in sorted(glob.glob(os.path.join("dados", "*.json"))):
+        pares.extend(pares_do_dataset(carregar_dataset(path)))
+    return [(pergunta, ctx) for _, pergunta, _, ctx in agrupar(pares)]
+
+
+def sem_uma_palavra(pergunta, rng):
+    palavras = pergunta.split()
+    if len(palavras) < 3:
+        return pergunta
+    del palavras[rng.integers(len(palavras))]
+    return " ".join(palavras)
+
+
+def esperar_indexacao(client, colecao, timeout=600):
+    inicio = time.perf_counter()
+    while client.get_collection(colecao).status != models.CollectionStatus.GREEN:
+        if time.perf_counter() - inicio > timeout:
+            print(f"⚠️ '{colecao}' ainda a indexar ao fim de {timeout}s — a medir assim mesmo.")
+            return
+        time.sleep(1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--perfis", nargs="+", default=list(PERFIS), choices=list(PERFIS))
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--consultas", type=int, default=300)
+    parser.add_argument("--extra", type=int, default=0, help="pontos sintéticos a juntar aos semeados")
+    parser.add_argument("--json", help="grava os resultados neste ficheiro")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(2024)
+    semeadas = perguntas_semeadas()
+    model = obter_modelo(MODEL_NAME)
+    cache = CacheEmbeddings()
+    vetores = normalizar_linhas(cache.codificar(MODEL_NAME, [q for q, _ in semeadas], model.encode, batch_size=64))
+    dim = vetores.shape[1]
+
+    escolhidas = rng.choice(len(semeadas), size=min(args.consultas, len(semeadas)), replace=False)
+    consultas = [(sem_uma_palavra(semeadas[i][0], rng), semeadas[i][1]) for i in escolhidas]
+    vetores_consulta = cache.codificar(MODEL_NAME, [q for q, _ in consultas], model.encode, batch_size=64)
+    cache.gravar()
+
+    def pontos():
+        for i, ((pergunta, ctx), v) in enumerate(zip(semeadas, vetores)):
+            yield models.PointStruct(id=i, vector=v.tolist(), payload={"pergunta": pergunta, "contexto": ctx})
+        # Vizinhos ruidosos dos semeados, com o mesmo contexto: o pior caso para o HNSW
+        for j in range(args.extra):
+            base = rng.integers(len(semeadas))
+            v = vetores[base] + rng.normal(0, 0.05, dim).astype(np.float32)
+            yield models.PointStruct(
+                id=len(semeadas) + j,
+                vector=(v / np.linalg.norm(v)).tolist(),
+                payload={"pergunta": "", "contexto": semeadas[base][1]},
+            )
+
+    client = obter_cliente(QDRANT_PATH, url=QDRANT_URL)
+    total = len(semeadas) + args.extra
+    print(f"🧪 {total} pontos ({len(semeadas)} semeados), {len(consultas)} consultas, k={args.k}"
+          f"{' — modo local: tudo exato' if modo_local(client) else ''}\n")
+    print(f"{'perfil':>12} {'recall@k':>9} {'p50 ms':>8} {'p95 ms':>8} {'exata p50':>10}")
+
+    resultados = {}
+    for perfil in args.perfis:
+        colecao = f"avaliacao_perfil_{perfil}"
+        if colecao in [c.name for c in client.get_collections().collections]:
+            client.delete_collection(colecao)
+        criar_colecao(client, colecao, dim, esquema={"contexto": models.PayloadSchemaType.KEYWORD}, perfil=perfil)
+        try:
+            for lote in em_lotes(pontos(), 512):
+                client.upsert(collection_name=colecao, points=lote)
+            esperar_indexacao(client, colecao)
+
+            recalls, tempos, tempos_exata = [], [], []
+            for (_, ctx), vetor in zip(consultas, vetores_consulta):
+                filtro = models.Filter(must=[models.FieldCondition(key="contexto", match=models.MatchValue(value=ctx))])
+                pedido = dict(collection_name=colecao, query_vector=vetor.tolist(), query_filter=filtro, limit=args.k)
+                t0 = time.perf_counter()
+                exata = client.search(**pedido, search_params=EXATA)
+                t1 = time.perf_counter()
+                aproximada = client.search(**pedido, search_params=parametros_pesquisa(perfil))
+                t2 = time.perf_counter()
+                referencia = {p.id for p in exata}
+                if referencia:
+                    recalls.append(len(referencia & {p.id for p in aproximada}) / len(referencia))
+                tempos_exata.append((t1 - t0) * 1000)
+                tempos.append((t2 - t1) * 1000)
+        finally:
+            client.delete_collection(colecao)
+
+        resultados[perfil] = {
+            "pontos": total,
+            "recall_at_k": float(np.mean(recalls)) if recalls else None,
+            "p50_ms": float(np.percentile(tempos, 50)),
+            "p95_ms": float(np.percentile(tempos, 95)),
+            "exata_p50_ms": float(np.percentile(tempos_exata, 50)),
+        }
+        r = resultados[perfil]
+        print(f"{perfil:>12} {r['recall_at_k'] or 0:>9.3f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['exata_p50_ms']:>10.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"k": args.k, "consultas": len(consultas), "perfis": resultados}, f, indent=2)
+        print(f"\n💾 Resultados em {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# benchmark_codificacao.py
+# Débito de codificação (pares/s) em função do número de processos, sobre as
+# perguntas geradas pelos datasets de dados/ (sem cache de embeddings).
+#   python benchmark_codificacao.py            # 1, 2, 4, … até ao nº de cores
+#   python benchmark_codificacao.py --pares 4000
+import os
+import glob
+import time
+import argparse
+
+import numpy as np
+
+from codificador_multiprocesso import CodificadorMultiprocesso
+from ingestao import carregar_dataset, pares_do_dataset
+
+MODEL_NAME = "intfloat/multilingual-e5-base"
+
+
+def contagens_de_processos(maximo):
+    n, contagens = 1, []
+    while n < maximo:
+        contagens.append(n)
+        n *= 2
+    return contagens + [maximo]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pares", type=int, default=2000, help="número de perguntas a codificar")
+    parser.add_argument("--batch", type=int, default=64)
+    args = parser.parse_args()
+
+    perguntas = []
+    for path in sorted(glob.glob(os.path.join("dados", "*.json"))):
+        perguntas.extend(q for q, _, _ in pares_do_dataset(carregar_dataset(path)))
+    perguntas = (perguntas * (args.pares // max(len(perguntas), 1) + 1))[: args.pares]
+    print(f"🧠 {len(perguntas)} perguntas, batch {args.batch}, {os.cpu_count()} cores\n")
+
+    referencia = None
+    print(f"{'processos':>9} {'segundos':>9} {'pares/s':>9} {'speedup':>8} {'mesma ordem':>12}")
+    for processos in contagens_de_processos(os.cpu_count() or 1):
+        with CodificadorMultiprocesso(MODEL_NAME, processos=processos) as codificador:
+            codificador.codificar(perguntas[: args.batch], batch_size=args.batch)  # aquecimento
+            inicio = time.perf_counter()
+            vetores = codificador.codificar(perguntas, batch_size=args.batch)
+            duracao = time.perf_counter() - inicio
+
+        if referencia is None:
+            referencia = (vetores, duracao)
+        mesma_ordem = np.allclose(vetores, referencia[0], atol=1e-4)
+        print(f"{processos:>9} {duracao:>9.2f} {len(perguntas) / duracao:>9.0f} "
+              f"{referencia[1] / duracao:>7.2f}x {str(mesma_ordem):>12}")
+
+
+if __name__ == "__main__":
+    main()
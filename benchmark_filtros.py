@@ -0,0 +1,108 @@
+# benchmark_filtros.py
+# Latência da pesquisa filtrada por `contexto` à medida que o histórico cresce,
+# com e sem índices de payload, numa coleção temporária:
+#   QDRANT_URL=http://localhost:6333 python benchmark_filtros.py
+#   python benchmark_filtros.py --tamanhos 10000 50000 100000 --pesquisas 200
+# No modo local (sem QDRANT_URL) os índices não têm efeito e só a coluna
+# "sem índice" é medida.
+import os
+import time
+import argparse
+
+import numpy as np
+from qdrant_client import models
+
+from colecoes import ESQUEMA_PAYLOAD, garantir_indices, modo_local
+from recursos import obter_cliente
+
+QDRANT_PATH = "qdrant_benchmark"
+QDRANT_URL = os.environ.get("QDRANT_URL")
+DIM = 768
+CONTEXTOS = ["geral", "festa", "futebol", "saudacao", "confirmacoes", "comida", "local", "hora"]
+USERS = ["Miguel", "Ana", "João", "Rita", "Pedro", "Inês"]
+PERSONALIDADES = ["formal", "divertido", "neutro"]
+
+
+def pontos_aleatorios(rng, inicio, n):
+    vetores = rng.standard_normal((n, DIM)).astype(np.float32)
+    vetores /= np.linalg.norm(vetores, axis=1, keepdims=True)
+    # Distribuição enviesada, como no histórico real: muito "geral", pouco do resto
+    pesos = np.array([0.5, 0.15, 0.1, 0.1, 0.05, 0.04, 0.03, 0.03])
+    contextos = rng.choice(CONTEXTOS, size=n, p=pesos)
+    return [
+        models.PointStruct(
+            id=inicio + i,
+            vector=vetores[i].tolist(),
+            payload={
+                "user": USERS[i % len(USERS)],
+                "personalidade": PERSONALIDADES[i % len(PERSONALIDADES)],
+                "contexto": str(contextos[i]),
+                "pergunta": f"pergunta {inicio + i}",
+                "resposta": "…",
+            },
+        )
+        for i in range(n)
+    ]
+
+
+def medir_pesquisas(client, colecao, consultas, contextos):
+    tempos = []
+    for vetor, contexto in zip(consultas, contextos):
+        filtro = models.Filter(must=[models.FieldCondition(key="contexto", match=models.MatchValue(value=contexto))])
+        t0 = time.perf_counter()
+        client.search(collection_name=colecao, query_vector=vetor.tolist(), query_filter=filtro, limit=3)
+        tempos.append((time.perf_counter() - t0) * 1000)
+    return np.percentile(tempos, [50, 95])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1000, 10000, 50000, 100000])
+    parser.add_argument("--pesquisas", type=int, default=100)
+    parser.add_argument("--lote", type=int, default=1000)
+    args = parser.parse_args()
+
+    client = obter_cliente(QDRANT_PATH, url=QDRANT_URL)
+    local = modo_local(client)
+    rng = np.random.default_rng(2024)
+    consultas = rng.standard_normal((args.pesquisas, DIM)).astype(np.float32)
+    contextos_consulta = rng.choice(CONTEXTOS[1:], size=args.pesquisas)
+
+    colecoes = {"sem": "benchmark_filtros_sem_indice"}
+    if not local:
+        colecoes["com"] = "benchmark_filtros_com_indice"
+    for tipo, nome in colecoes.items():
+        client.recreate_collection(
+            collection_name=nome,
+            vectors_config=models.VectorParams(size=DIM, distance=models.Distance.COSINE),
+        )
+        if tipo == "com":
+            garantir_indices(client, nome, ESQUEMA_PAYLOAD)
+    print(f"🧪 Pesquisa filtrada por contexto, {args.pesquisas} pesquisas por ponto de medida "
+          f"({'modo local, sem índices' if local else QDRANT_URL})\n")
+
+    print(f"{'pontos':>8} {'sem p50':>9} {'sem p95':>9} {'com p50':>9} {'com p95':>9}   (ms)")
+    total = 0
+    try:
+        for tamanho in sorted(args.tamanhos):
+            while total < tamanho:
+                n = min(args.lote, tamanho - total)
+                pontos = pontos_aleatorios(rng, total, n)
+                for nome in colecoes.values():
+                    client.upsert(collection_name=nome, points=pontos, wait=True)
+                total += n
+            linha = f"{total:>8}"
+            for tipo in ("sem", "com"):
+                if tipo in colecoes:
+                    p50, p95 = medir_pesquisas(client, colecoes[tipo], consultas, contextos_consulta)
+                    linha += f" {p50:>9.2f} {p95:>9.2f}"
+                else:
+                    linha += f" {'—':>9} {'—':>9}"
+            print(linha)
+    finally:
+        for nome in colecoes.values():
+            client.delete_collection(nome)
+
+
+if __name__ == "__main__":
+    main()
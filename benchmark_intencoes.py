@@ -0,0 +1,48 @@
+# benchmark_intencoes.py
+# Compara o ciclo antigo (util.cos_sim por intenção) com o MotorIntencoes
+# vetorizado, à medida que cresce o número de intenções e de exemplos.
+import time
+import numpy as np
+import torch
+from sentence_transformers import util
+
+from motor_intencoes import MotorIntencoes, LIMIAR_GERAL
+
+DIM = 768
+REPETICOES = 200
+rng = np.random.default_rng(42)
+
+
+def ciclo_antigo(pergunta_vec, intencoes_embeds):
+    melhor_intencao, melhor_score = "geral", LIMIAR_GERAL
+    for k, embeds in intencoes_embeds.items():
+        sim = util.cos_sim(pergunta_vec, embeds).mean().item()
+        if sim > melhor_score:
+            melhor_intencao, melhor_score = k, sim
+    return melhor_intencao
+
+
+def cronometrar(fn, *args):
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        fn(*args)
+    return (time.perf_counter() - inicio) / REPETICOES * 1e6
+
+
+print(f"{'intenções':>10} {'exemplos':>9} {'ciclo (µs)':>11} {'matmul (µs)':>12} {'ganho':>7} {'iguais':>7}")
+for n_intencoes in (9, 25, 100, 400):
+    for n_exemplos in (5, 20, 50):
+        embeds = {
+            f"intencao_{i}": rng.standard_normal((n_exemplos, DIM)).astype(np.float32)
+            for i in range(n_intencoes)
+        }
+        tensores = {k: torch.from_numpy(v) for k, v in embeds.items()}
+        motor = MotorIntencoes(embeds)
+        # Pergunta perto de uma intenção para o limiar ser ultrapassado
+        pergunta = embeds["intencao_0"].mean(axis=0) + 0.1 * rng.standard_normal(DIM).astype(np.float32)
+        pergunta_t = torch.from_numpy(pergunta)
+
+        t_ciclo = cronometrar(ciclo_antigo, pergunta_t, tensores)
+        t_motor = cronometrar(motor.identificar, pergunta)
+        iguais = ciclo_antigo(pergunta_t, tensores) == motor.identificar(pergunta)
+        print(f"{n_intencoes:>10} {n_exemplos:>9} {t_ciclo:>11.1f} {t_motor:>12.1f} {t_ciclo / t_motor:>6.1f}x {str(iguais):>7}")
@@ -0,0 +1,85 @@
+# benchmark_memoria.py
+# Procura aproximada do learning_memory: varrimento linear com difflib vs
+# índice de trigramas, à medida que a memória cresce. Mede também quantas
+# das correspondências do varrimento o índice encontra (recall).
+#   python benchmark_memoria.py
+#   python benchmark_memoria.py --tamanhos 1000 10000 50000 --consultas 200
+import glob
+import os
+import time
+import random
+import difflib
+import argparse
+
+from indice_trigramas import IndiceTrigramas
+from ingestao import carregar_dataset, pares_do_dataset
+from normalizacao import normalizar
+
+LIMIAR = 0.8
+
+
+def varrimento_linear(pergunta, chaves):
+    """O algoritmo antigo: a primeira chave com rácio acima do limiar."""
+    for chave in chaves:
+        if difflib.SequenceMatcher(None, chave, pergunta).ratio() > LIMIAR:
+            return chave
+    return None
+
+
+def perguntas_sinteticas(base, n, rng):
+    """Frases de 3 a 8 palavras do vocabulário dos datasets, para simular uma memória grande e variada."""
+    vocabulario = sorted({p for q in base for p in q.split()})
+    vistas = set()
+    while len(vistas) < n:
+        vistas.add(" ".join(rng.choice(vocabulario) for _ in range(rng.randint(3, 8))))
+    return list(vistas)
+
+
+def com_erros(texto, rng):
+    """Uma ou duas trocas de caracteres (gralhas)."""
+    chars = list(texto)
+    for _ in range(rng.randint(1, 2)):
+        chars[rng.randrange(len(chars))] = rng.choice("abcdefghijklmnopqrstuvwxyz ")
+    return "".join(chars)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1000, 5000, 20000, 50000])
+    parser.add_argument("--consultas", type=int, default=100)
+    parser.add_argument("--linear-ate", type=int, default=20000, help="não corre o varrimento linear acima disto")
+    args = parser.parse_args()
+
+    rng = random.Random(2024)
+    base = []
+    for path in sorted(glob.glob(os.path.join("dados", "*.json"))):
+        base.extend(normalizar(q) for q, _, _ in pares_do_dataset(carregar_dataset(path)))
+    chaves = perguntas_sinteticas(base, max(args.tamanhos), rng)
+
+    print(f"{'chaves':>8} {'linear ms':>10} {'índice ms':>10} {'speedup':>8} {'recall':>7}")
+    for tamanho in sorted(args.tamanhos):
+        subconjunto = chaves[:tamanho]
+        indice = IndiceTrigramas(limiar=LIMIAR)
+        for chave in subconjunto:
+            indice.adicionar(chave)
+        # Metade gralhas de chaves existentes (têm de ser encontradas), metade perguntas novas
+        consultas = [com_erros(rng.choice(subconjunto), rng) for _ in range(args.consultas // 2)]
+        consultas += [normalizar(rng.choice(base)) for _ in range(args.consultas - len(consultas))]
+
+        t0 = time.perf_counter()
+        encontradas_indice = [indice.procurar(q) for q in consultas]
+        t_indice = (time.perf_counter() - t0) * 1000 / len(consultas)
+
+        if tamanho <= args.linear_ate:
+            t0 = time.perf_counter()
+            encontradas_linear = [varrimento_linear(q, subconjunto) for q in consultas]
+            t_linear = (time.perf_counter() - t0) * 1000 / len(consultas)
+            esperadas = [i for i, c in enumerate(encontradas_linear) if c is not None]
+            recall = sum(encontradas_indice[i] is not None for i in esperadas) / len(esperadas) if esperadas else 1.0
+            print(f"{tamanho:>8} {t_linear:>10.2f} {t_indice:>10.3f} {t_linear / t_indice:>7.0f}x {recall:>7.3f}")
+        else:
+            print(f"{tamanho:>8} {'—':>10} {t_indice:>10.3f} {'—':>8} {'—':>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# cache_embeddings.py
+import os
+import json
+import time
+import uuid
+import atexit
+import hashlib
+import threading
+
+import numpy as np
+
+from diario import bloqueio
+
+CACHE_PATH = "embeddings_cache"
+CAPACIDADE_PADRAO = 50_000
+VIAS = 4  # posições possíveis para cada chave (cache associativa por conjuntos)
+
+
+# =====================================================
+# 🗄️ LOJA DE UM MODELO (partilhada entre processos)
+# =====================================================
+class _LojaModelo:
+    """
+    Vetores de um modelo em <pasta>/<hash do modelo>/, com a dimensão desse
+    modelo. Não há índice: a chave escolhe um conjunto de VIAS posições e
+    `marcas.bin` guarda a impressão digital (64 bits) da chave em cada posição
+    (0 = livre), por isso todos os processos veem o mesmo estado sem trocar
+    índices. As escritas são feitas sob um flock; as leituras não bloqueiam e
+    confirmam a marca antes e depois de copiar o vetor. Cheio o conjunto, sai a
+    posição com o uso (`usos.bin`) mais antigo.
+    """
+
+    def __init__(self, pasta, nome_modelo, conjuntos, dtype):
+        self.nome_modelo = nome_modelo
+        self.pasta = os.path.join(pasta, hashlib.sha1(nome_modelo.encode("utf-8")).hexdigest()[:16])
+        self.conjuntos = conjuntos
+        self.capacidade = conjuntos * VIAS
+        self.dtype = dtype
+        self.dim = None
+        self._id = None
+        self._vetores = self._marcas = self._usos = None
+        os.makedirs(self.pasta, exist_ok=True)
+        self._path_lock = os.path.join(self.pasta, "lock")
+        self._abrir(self._ler_meta())
+
+    def _path(self, nome):
+        return os.path.join(self.pasta, nome)
+
+    def _ler_meta(self):
+        try:
+            with open(self._path("meta.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _compativel(self, meta, dim=None):
+        return (
+            meta is not None
+            and meta.get("capacidade") == self.capacidade
+            and meta.get("dtype") == self.dtype.name
+            and (dim is None or meta.get("dim") == dim)
+        )
+
+    def _abrir(self, meta):
+        if not self._compativel(meta):
+            return
+        forma = (self.capacidade,)
+        self._vetores = np.memmap(self._path("vetores.bin"), dtype=self.dtype, mode="r+",
+                                  shape=(self.capacidade, meta["dim"]))
+        self._marcas = np.memmap(self._path("marcas.bin"), dtype=np.uint64, mode="r+", shape=forma)
+        self._usos = np.memmap(self._path("usos.bin"), dtype=np.uint32, mode="r+", shape=forma)
+        self.dim, self._id = meta["dim"], meta["id"]
+
+    def _criar(self, dim):
+        """Ficheiros novos (tmp + os.replace), com o meta.json por último. Chamar sob o flock."""
+        for nome, dtype, forma in (("vetores.bin", self.dtype, (self.capacidade, dim)),
+                                   ("marcas.bin", np.uint64, (self.capacidade,)),
+                                   ("usos.bin", np.uint32, (self.capacidade,))):
+            tmp = self._path(nome + ".tmp")
+            np.memmap(tmp, dtype=dtype, mode="w+", shape=forma).flush()
+            os.replace(tmp, self._path(nome))
+        meta = {"dim": dim, "dtype": self.dtype.name, "capacidade": self.capacidade,
+                "modelo": self.nome_modelo, "id": uuid.uuid4().hex}
+        tmp = self._path("meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._path("meta.json"))
+        return meta
+
+    def _garantir(self, dim):
+        """Sob o flock: abre a loja atual do disco, ou cria uma se faltar ou tiver outra dimensão."""
+        meta = self._ler_meta()
+        if not self._compativel(meta, dim):
+            if meta is not None:
+                print(f"⚠️ Cache de embeddings de '{self.nome_modelo}' com formato diferente — a recomeçar do zero.")
+            meta = self._criar(dim)
+        if meta["id"] != self._id:
+            self._abrir(meta)
+
+    def obter(self, marca, conjunto):
+        if self._marcas is None:
+            self._abrir(self._ler_meta())  # outro processo pode já a ter criado
+            if self._marcas is None:
+                return None
+        base = conjunto * VIAS
+        for via in np.flatnonzero(self._marcas[base:base + VIAS] == marca):
+            posicao = base + int(via)
+            vetor = np.array(self._vetores[posicao], dtype=np.float32)
+            # Se outro processo reescreveu a posição entretanto, a marca mudou
+            if self._marcas[posicao] == marca:
+                self._usos[posicao] = int(time.time())
+                return vetor
+        return None
+
+    def guardar(self, marca, conjunto, vetor):
+        with bloqueio(self._path_lock):
+            self._garantir(vetor.shape[-1])
+            base = conjunto * VIAS
+            marcas = self._marcas[base:base + VIAS]
+            iguais = np.flatnonzero(marcas == marca)
+            if len(iguais):
+                via = int(iguais[0])
+            else:
+                # Livre primeiro (uso -1), depois a de uso mais antigo
+                usos = np.where(marcas == 0, -1, self._usos[base:base + VIAS].astype(np.int64))
+                via = int(np.argmin(usos))
+            posicao = base + via
+            self._marcas[posicao] = 0
+            self._vetores[posicao] = vetor
+            self._marcas[posicao] = marca
+            self._usos[posicao] = int(time.time())
+
+    def entradas(self):
+        return 0 if self._marcas is None else int(np.count_nonzero(self._marcas))
+
+    def gravar(self):
+        for arr in (self._vetores, self._marcas, self._usos):
+            if arr is not None:
+                arr.flush()
+
+
+# =====================================================
+# 🗄️ CACHE PERSISTENTE DE EMBEDDINGS
+# =====================================================
+class CacheEmbeddings:
+    """
+    Cache em disco de embeddings endereçado por conteúdo (modelo + texto),
+    partilhada por todos os processos que usam a mesma pasta (app, serviço,
+    ingestão, migração). Cada modelo tem a sua loja, com a sua dimensão, em
+    arrays memory-mapped de capacidade fixa (float16 por omissão).
+    `capacidade=0` desliga a cache.
+    """
+
+    def __init__(self, pasta=CACHE_PATH, capacidade=CAPACIDADE_PADRAO, dtype="float16"):
+        self.pasta = pasta
+        self.conjuntos = max(1, capacidade // VIAS) if capacidade else 0
+        self.capacidade = self.conjuntos * VIAS
+        self.dtype = np.dtype(dtype)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._lojas = {}
+        if self.capacidade:
+            os.makedirs(pasta, exist_ok=True)
+            atexit.register(self.gravar)
+
+    def _loja(self, nome_modelo):
+        with self._lock:
+            loja = self._lojas.get(nome_modelo)
+            if loja is None:
+                loja = self._lojas[nome_modelo] = _LojaModelo(self.pasta, nome_modelo, self.conjuntos, self.dtype)
+            return loja
+
+    def gravar(self):
+        """Flush dos vetores para o disco (o estado já é partilhado pelo page cache)."""
+        for loja in list(self._lojas.values()):
+            loja.gravar()
+
+    # --- acesso ---
+    def _posicao(self, nome_modelo, texto):
+        digest = hashlib.sha1(f"{nome_modelo}\x00{texto.strip()}".encode("utf-8")).digest()
+        marca = int.from_bytes(digest[:8], "little") or 1
+        return np.uint64(marca), int.from_bytes(digest[8:16], "little") % self.conjuntos
+
+    def obter(self, nome_modelo, texto):
+        """Devolve o vetor em cache (float32) ou None."""
+        if not self.capacidade:
+            return None
+        vetor = self._loja(nome_modelo).obter(*self._posicao(nome_modelo, texto))
+        if vetor is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return vetor
+
+    def guardar(self, nome_modelo, texto, vetor):
+        """Insere (ou atualiza) um vetor, despejando a entrada menos usada do conjunto."""
+        if not self.capacidade:
+            return
+        marca, conjunto = self._posicao(nome_modelo, texto)
+        self._loja(nome_modelo).guardar(marca, conjunto, np.asarray(vetor, dtype=np.float32))
+
+    def codificar(self, nome_modelo, textos, encode, **kwargs):
+        """
+        Devolve os embeddings de `textos` pela mesma ordem, chamando
+        `encode` (ex.: model.encode) só uma vez e só para os que faltam.
+        """
+        resultado = [self.obter(nome_modelo, t) for t in textos]
+        em_falta = [i for i, v in enumerate(resultado) if v is None]
+        if em_falta:
+            # Textos repetidos no mesmo lote só são codificados uma vez
+            unicos = list(dict.fromkeys(textos[i] for i in em_falta))
+            novos = np.asarray(encode(unicos, **kwargs), dtype=np.float32)
+            por_texto = dict(zip(unicos, novos))
+            for texto, vetor in por_texto.items():
+                self.guardar(nome_modelo, texto, vetor)
+            for i in em_falta:
+                resultado[i] = por_texto[textos[i]]
+        if not resultado:
+            loja = self._lojas.get(nome_modelo)
+            return np.empty((0, loja.dim if loja and loja.dim else 0), dtype=np.float32)
+        return np.vstack(resultado)
+
+    def estatisticas(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "taxa_hits": self.hits / total if total else 0.0,
+            "entradas": sum(loja.entradas() for loja in list(self._lojas.values())),
+            "capacidade": self.capacidade,
+        }
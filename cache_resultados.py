@@ -0,0 +1,204 @@
+# cache_resultados.py
+import time
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from motor_intencoes import normalizar_linhas
+
+CAPACIDADE_PADRAO = 2048
+TTL_PADRAO_S = 300
+# Folga ao comparar scores: bem acima do arredondamento dos embeddings em cache
+# (float16, ~1e-3) e do da chave int8 (~2e-3 por produto interno)
+MARGEM_SCORE = 1e-2
+
+
+def quantizar(vetor):
+    """Embedding normalizado em int8: os bytes são a chave da entrada."""
+    return np.round(normalizar_linhas(vetor).reshape(-1) * 127).astype(np.int8)
+
+
+class _Grupo:
+    """
+    Vetores (float32, normalizados) das perguntas guardadas de um (contexto,
+    top_k), numa matriz que cresce por duplicação e reaproveita as linhas
+    libertadas, com o melhor score de cada resultado ao lado: uma escrita
+    compara-se com todas as entradas num só produto matriz-matriz.
+    """
+
+    def __init__(self, dim, capacidade=64):
+        self.matriz = np.zeros((capacidade, dim), dtype=np.float32)
+        self.melhores = np.full(capacidade, np.inf, dtype=np.float32)
+        self.chaves = []      # linha → chave (None se livre)
+        self.linha_de = {}
+        self.livres = []
+
+    def __len__(self):
+        return len(self.linha_de)
+
+    def adicionar(self, chave, vetor, melhor_score):
+        if self.livres:
+            linha = self.livres.pop()
+            self.chaves[linha] = chave
+        else:
+            linha = len(self.chaves)
+            if linha == len(self.matriz):
+                self.matriz = np.concatenate([self.matriz, np.zeros_like(self.matriz)])
+                self.melhores = np.concatenate([self.melhores, np.full_like(self.melhores, np.inf)])
+            self.chaves.append(chave)
+        self.linha_de[chave] = linha
+        self.matriz[linha] = vetor
+        self.melhores[linha] = melhor_score
+
+    def remover(self, chave):
+        linha = self.linha_de.pop(chave)
+        self.chaves[linha] = None
+        self.matriz[linha] = 0
+        self.melhores[linha] = np.inf  # linha livre nunca é ultrapassada
+        self.livres.append(linha)
+
+    def ultrapassadas(self, novos):
+        """[(chave, índices dos pontos novos com score acima do melhor guardado)]."""
+        n = len(self.chaves)
+        acima = (self.matriz[:n] @ novos.T) > (self.melhores[:n, None] + MARGEM_SCORE)
+        return [(self.chaves[linha], np.flatnonzero(acima[linha])) for linha in np.flatnonzero(acima.any(axis=1))]
+
+
+# =====================================================
+# 🗃️ CACHE DE RESULTADOS DA PESQUISA SEMÂNTICA
+# =====================================================
+class CacheResultados:
+    """
+    LRU com TTL para resultados de pesquisa, endereçada pelo embedding
+    quantizado da pergunta (mais o contexto e o top_k).
+
+    Uma escrita com vetores só apaga as entradas (do contexto escrito e as
+    sem filtro, contexto None) cujo melhor resultado algum ponto novo
+    ultrapassaria com outra resposta — é o primeiro que decide a resposta.
+    Registar um turno respondido a partir do resultado guardado (a resposta
+    está em `respostas_de(payload)` do melhor) não o invalida, por isso a
+    conversa deixa de esvaziar o contexto a cada turno. Sem vetores,
+    `invalidar(contexto)` apaga o contexto todo e `invalidar()` tudo. Um
+    resultado cuja pesquisa se cruzou com uma escrita (a geração lida antes
+    de pesquisar mudou) não é guardado.
+    """
+
+    def __init__(self, capacidade=CAPACIDADE_PADRAO, ttl_s=TTL_PADRAO_S, respostas_de=None):
+        self.capacidade = capacidade
+        self.ttl_s = ttl_s
+        self.respostas_de = respostas_de
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entradas = OrderedDict()  # (bytes, contexto, top_k) → (expira, valor)
+        self._grupos = {}               # (contexto, top_k) → _Grupo
+        self._geracao = 0
+        self._geracoes = {}             # contexto → geração
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def _marca(self, contexto):
+        return self._geracao, self._geracoes.get(contexto, 0)
+
+    def geracao(self, contexto):
+        """Marca a ler ANTES de pesquisar e a passar a `guardar`."""
+        with self._lock:
+            return self._marca(contexto)
+
+    def _apagar(self, chave):
+        """Chamar sob o lock."""
+        del self._entradas[chave]
+        grupo = self._grupos[chave[1:]]
+        grupo.remover(chave)
+        if not len(grupo):
+            del self._grupos[chave[1:]]
+
+    # --- acesso ---
+    def obter(self, vetor, contexto, top_k):
+        """Resultado guardado para este embedding, ou None."""
+        if not self.capacidade:
+            return None
+        chave = (quantizar(vetor).tobytes(), contexto, top_k)
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None or entrada[0] < time.monotonic():
+                if entrada is not None:
+                    self._apagar(chave)
+                self.misses += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.hits += 1
+            return entrada[1]
+
+    def guardar(self, vetor, contexto, top_k, valor, geracao):
+        if not self.capacidade:
+            return
+        vetor = normalizar_linhas(vetor).reshape(-1)
+        chave = (quantizar(vetor).tobytes(), contexto, top_k)
+        # Resultado vazio: qualquer ponto novo no contexto o ultrapassa
+        melhor_score = valor[0][0] if valor else -np.inf
+        with self._lock:
+            if geracao != self._marca(contexto):
+                return  # uma escrita chegou durante a pesquisa
+            if chave in self._entradas:
+                self._apagar(chave)
+            self._entradas[chave] = (time.monotonic() + self.ttl_s, valor)
+            if (contexto, top_k) not in self._grupos:
+                self._grupos[(contexto, top_k)] = _Grupo(len(vetor))
+            self._grupos[(contexto, top_k)].adicionar(chave, vetor, melhor_score)
+            while len(self._entradas) > self.capacidade:
+                self._apagar(next(iter(self._entradas)))
+
+    def _muda_resposta(self, resultado, indices, respostas):
+        """Algum dos pontos novos que passam à frente traz uma resposta que o melhor não dava?"""
+        if not resultado or respostas is None or self.respostas_de is None:
+            return True
+        conhecidas = set(self.respostas_de(resultado[0][1]))
+        return any(respostas[j] not in conhecidas for j in indices)
+
+    def invalidar(self, contexto=None, vetores=None, respostas=None):
+        """
+        Escrita em `contexto` (ou em tudo, se None), com os vetores dos pontos
+        escritos e, opcionalmente, a resposta de cada um.
+        """
+        with self._lock:
+            if contexto is None:
+                self._geracao += 1
+                self._limpar()
+                return
+            # As pesquisas sem filtro (contexto None) também veem esta escrita
+            self._geracoes[contexto] = self._geracoes.get(contexto, 0) + 1
+            self._geracoes[None] = self._geracoes.get(None, 0) + 1
+            novos = None if vetores is None else normalizar_linhas(np.asarray(vetores, dtype=np.float32))
+            for chave_grupo in [g for g in self._grupos if g[0] in (contexto, None)]:
+                grupo = self._grupos[chave_grupo]
+                if novos is None:
+                    apagar = [c for c in grupo.chaves if c is not None]
+                else:
+                    apagar = [
+                        chave for chave, indices in grupo.ultrapassadas(novos)
+                        if self._muda_resposta(self._entradas[chave][1], indices, respostas)
+                    ]
+                for chave in apagar:
+                    self._apagar(chave)
+
+    def _limpar(self):
+        self._entradas.clear()
+        self._grupos.clear()
+
+    def limpar(self):
+        with self._lock:
+            self._limpar()
+            self._geracao += 1
+
+    def estatisticas(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "taxa_hits": self.hits / total if total else 0.0,
+            "entradas": len(self._entradas),
+            "capacidade": self.capacidade,
+        }
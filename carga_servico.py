@@ -0,0 +1,139 @@
+# carga_servico.py
+# Gerador de carga para o servico.py: N ligações HTTP/1.1 keep-alive em
+# paralelo (asyncio puro, sem dependências), cada uma a enviar POST
+# /responder seguidos. Mede débito, latência e quantos pedidos foram
+# recusados (503) — útil para afinar CHATBOT_LOTE_MAX / _ESPERA_MS / FILA_MAX.
+#   python servico.py &
+#   python carga_servico.py --ligacoes 50 --pedidos 2000
+#   python carga_servico.py --url http://localhost:8000 --json carga.json
+#   python carga_servico.py --perguntas avaliacao_parafrases.json --variar
+# Com --variar cada pergunta leva palavras de enchimento ao acaso: textos fora
+# do índice exato (só tem as sementes), que se repetem ao longo da carga e
+# exercitam a pesquisa semântica e a cache de resultados.
+import json
+import time
+import random
+import asyncio
+import argparse
+from collections import Counter
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from evento import carregar_json
+
+PERGUNTAS_OMISSAO = [
+    "a que horas começa a festa?", "qual é a password do wifi", "onde é a festa",
+    "o que levo?", "quem vai à festa", "qual é o dress code", "olá", "há comida?",
+]
+PREFIXOS = ["", "então", "diácono", "olha", "já agora", "ei"]
+SUFIXOS = ["", "por favor", "pá", "afinal", "mesmo", "diz lá"]
+
+
+def variar(pergunta, rng):
+    return " ".join(p for p in (rng.choice(PREFIXOS), pergunta, rng.choice(SUFIXOS)) if p)
+
+
+def carregar_perguntas(path):
+    if not path:
+        return PERGUNTAS_OMISSAO
+    with open(path, encoding="utf-8-sig") as f:
+        if path.endswith(".json"):
+            dados = json.load(f)
+            itens = dados.get("itens", dados.get("perguntas", [])) if isinstance(dados, dict) else dados
+            return [i["pergunta"] if isinstance(i, dict) else i for i in itens]
+        return [linha.strip() for linha in f if linha.strip()]
+
+
+async def _pedido(reader, writer, host, corpo):
+    writer.write(
+        f"POST /responder HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(corpo)}\r\n\r\n".encode() + corpo
+    )
+    await writer.drain()
+    cabecalho = await reader.readuntil(b"\r\n\r\n")
+    linhas = cabecalho.decode("latin-1").split("\r\n")
+    estado = int(linhas[0].split()[1])
+    cabecalhos = {k.strip().lower(): v.strip() for k, _, v in (l.partition(":") for l in linhas[1:] if l)}
+    await reader.readexactly(int(cabecalhos.get("content-length", 0)))
+    return estado, cabecalhos.get("connection", "").lower() == "close"
+
+
+async def _ligacao(n, url, perguntas, nomes, contador, latencias, estados, rng, variacoes):
+    """Uma ligação keep-alive que envia pedidos até o contador partilhado chegar a zero."""
+    host, porta = url.hostname, url.port or 80
+    reader = writer = None
+    sessao = f"carga-{n}"
+    while contador[0] > 0:
+        contador[0] -= 1
+        pergunta = rng.choice(perguntas)
+        if variacoes:
+            pergunta = variar(pergunta, rng)
+        corpo = json.dumps({"pergunta": pergunta, "nome": nomes[n % len(nomes)], "sessao": sessao},
+                           ensure_ascii=False).encode("utf-8")
+        t0 = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, porta)
+            estado, fechar = await _pedido(reader, writer, url.netloc, corpo)
+        except (OSError, asyncio.IncompleteReadError) as e:
+            estados[type(e).__name__] += 1
+            writer = None
+            continue
+        estados[estado] += 1
+        if estado == 200:  # as recusas (503) são imediatas e baixariam os percentis
+            latencias.append((time.perf_counter() - t0) * 1000)
+        if fechar:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def correr(url, ligacoes, pedidos, perguntas, nomes, variacoes=False, seed=0):
+    rng = random.Random(seed)
+    contador, latencias, estados = [pedidos], [], Counter()
+    t0 = time.perf_counter()
+    await asyncio.gather(*[
+        _ligacao(n, url, perguntas, nomes, contador, latencias, estados, rng, variacoes) for n in range(ligacoes)
+    ])
+    duracao = time.perf_counter() - t0
+    p50, p95, p99 = np.percentile(latencias, [50, 95, 99]) if latencias else (0, 0, 0)
+    return {
+        "ligacoes": ligacoes, "pedidos": pedidos, "duracao_s": duracao,
+        "respostas_por_s": len(latencias) / duracao if duracao else 0.0,
+        "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+        "estados": {str(k): v for k, v in sorted(estados.items(), key=lambda kv: str(kv[0]))},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga sobre o POST /responder do servico.py.")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--ligacoes", type=int, default=20, help="ligações concorrentes")
+    parser.add_argument("--pedidos", type=int, default=500, help="total de pedidos")
+    parser.add_argument("--perguntas", help=".txt (uma por linha) ou .json (ex.: avaliacao_parafrases.json)")
+    parser.add_argument("--variar", action="store_true", help="junta palavras de enchimento ao acaso às perguntas")
+    parser.add_argument("--json", help="grava o relatório neste ficheiro")
+    args = parser.parse_args()
+
+    # O serviço só aceita convidados de profiles.json
+    nomes = [p["nome"] for p in carregar_json("profiles.json", default=[])]
+    if not nomes:
+        parser.error("faltam perfis em 'profiles.json'")
+    url = urlsplit(args.url)
+    relatorio = asyncio.run(correr(url, args.ligacoes, args.pedidos, carregar_perguntas(args.perguntas), nomes, args.variar))
+
+    print(f"🚀 {relatorio['pedidos']} pedidos em {relatorio['ligacoes']} ligações: "
+          f"{relatorio['duracao_s']:.1f} s · {relatorio['respostas_por_s']:.0f} respostas/s")
+    print(f"⏱️ (respostas 200) p50 {relatorio['p50_ms']:.1f} ms · p95 {relatorio['p95_ms']:.1f} ms · p99 {relatorio['p99_ms']:.1f} ms")
+    print(f"📬 Estados: {relatorio['estados']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        print(f"💾 Relatório em {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+# cliente_servico.py
+# Cliente do servico.py para a app em modo fino (CHATBOT_SERVICO_URL), só
+# com a biblioteca padrão: a app deixa de carregar o modelo e o Qdrant.
+import json
+import urllib.error
+import urllib.request
+
+TIMEOUT_S = 15
+
+RESPOSTA_OCUPADO = "Está muita gente a falar comigo ao mesmo tempo 😅 Tenta outra vez daqui a nada!"
+RESPOSTA_ERRO = "Perdi a ligação ao Diácono 🙏 Tenta outra vez daqui a pouco."
+
+
+def responder_remoto(url, pergunta, perfil, sessao, timeout=TIMEOUT_S):
+    """Resposta (já com o tom ajustado) pedida ao serviço; mensagem amigável se falhar."""
+    corpo = json.dumps({"pergunta": pergunta, "perfil": perfil, "sessao": sessao}, ensure_ascii=False)
+    pedido = urllib.request.Request(
+        url.rstrip("/") + "/responder",
+        data=corpo.encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(pedido, timeout=timeout) as r:
+            return json.loads(r.read().decode("utf-8"))["resposta"]
+    except urllib.error.HTTPError as e:
+        print(f"⚠️ Serviço respondeu {e.code} a '{pergunta}'")
+        return RESPOSTA_OCUPADO if e.code == 503 else RESPOSTA_ERRO
+    except (urllib.error.URLError, TimeoutError, ValueError, KeyError) as e:
+        print(f"⚠️ Erro ao contactar o serviço: {e}")
+        return RESPOSTA_ERRO
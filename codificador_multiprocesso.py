@@ -0,0 +1,51 @@
+# codificador_multiprocesso.py
+import os
+import math
+
+from recursos import obter_modelo
+
+# Abaixo disto o custo de distribuir pelos processos não compensa
+MINIMO_PARA_POOL = 256
+
+
+# =====================================================
+# 🧵 CODIFICAÇÃO EM VÁRIOS PROCESSOS
+# =====================================================
+class CodificadorMultiprocesso:
+    """
+    Reparte os lotes por um pool de processos do sentence-transformers
+    (um modelo por processo, em CPU). A ordem dos vetores devolvidos é sempre
+    a ordem dos textos de entrada, qualquer que seja o número de processos.
+
+    Usar dentro de `if __name__ == "__main__":` — os processos são criados
+    com "spawn" e reimportam o script principal.
+    """
+
+    def __init__(self, nome_modelo, processos=None, chunk_size=None):
+        self.model = obter_modelo(nome_modelo)
+        self.processos = processos or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.pool = None
+        if self.processos > 1:
+            print(f"🧵 A iniciar {self.processos} processos de codificação…")
+            self.pool = self.model.start_multi_process_pool(target_devices=["cpu"] * self.processos)
+
+    def codificar(self, textos, batch_size=64, **_):
+        """Mesma interface que model.encode para listas (argumentos extra são ignorados)."""
+        textos = list(textos)
+        if self.pool is None or len(textos) < MINIMO_PARA_POOL:
+            return self.model.encode(textos, batch_size=batch_size, show_progress_bar=False)
+        # Um pedaço por processo (no mínimo um batch) em vez dos pedaços minúsculos por omissão
+        chunk_size = self.chunk_size or max(batch_size, math.ceil(len(textos) / self.processos))
+        return self.model.encode_multi_process(textos, self.pool, batch_size=batch_size, chunk_size=chunk_size)
+
+    def fechar(self):
+        if self.pool is not None:
+            self.model.stop_multi_process_pool(self.pool)
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
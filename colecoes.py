@@ -0,0 +1,163 @@
+# colecoes.py
+import os
+from datetime import datetime
+
+from qdrant_client import models
+from qdrant_client.local.qdrant_local import QdrantLocal
+
+# Campos filtrados ou lidos por filtro na coleção principal (contexto nas
+# pesquisas, user/personalidade nas confirmações e no histórico)
+ESQUEMA_PAYLOAD = {
+    "contexto": models.PayloadSchemaType.KEYWORD,
+    "user": models.PayloadSchemaType.KEYWORD,
+    "personalidade": models.PayloadSchemaType.KEYWORD,
+}
+
+
+# =====================================================
+# ⚙️ PERFIS DE COLEÇÃO (HNSW / QUANTIZAÇÃO / DISCO)
+# =====================================================
+# Escolhidos com CHATBOT_PERFIL; o perfil só se aplica a coleções novas, por
+# isso mudar de perfil numa base existente faz-se com migrar_colecao.py.
+# Os números vêm de avaliar_perfis.py (recall@k vs latência).
+PERFIS = {
+    # Poucos milhares de pontos: pesquisa exaustiva, recall 1.0 e sem grafo a manter
+    "pequeno": {
+        "hnsw": models.HnswConfigDiff(m=0),
+        "quantizacao": None,
+        "on_disk": False,
+        "pesquisa": models.SearchParams(exact=True),
+    },
+    # Os valores por omissão do Qdrant, com ef de pesquisa um pouco acima
+    "equilibrado": {
+        "hnsw": models.HnswConfigDiff(m=16, ef_construct=100),
+        "quantizacao": None,
+        "on_disk": False,
+        "pesquisa": models.SearchParams(hnsw_ef=128),
+    },
+    # Histórico grande: vetores originais em disco, int8 em RAM e rescoring
+    # com os originais sobre 2× candidatos para recuperar o recall
+    "grande": {
+        "hnsw": models.HnswConfigDiff(m=16, ef_construct=200),
+        "quantizacao": models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True)
+        ),
+        "on_disk": True,
+        "pesquisa": models.SearchParams(
+            hnsw_ef=128,
+            quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0),
+        ),
+    },
+}
+PERFIL_OMISSAO = "equilibrado"
+
+
+def obter_perfil(nome=None):
+    nome = nome or os.environ.get("CHATBOT_PERFIL", PERFIL_OMISSAO)
+    if nome not in PERFIS:
+        raise ValueError(f"Perfil de coleção desconhecido: '{nome}' (opções: {', '.join(PERFIS)})")
+    return PERFIS[nome]
+
+
+def parametros_pesquisa(perfil=None):
+    """SearchParams do perfil, para passar em `search_params=`."""
+    return obter_perfil(perfil)["pesquisa"]
+
+
+# =====================================================
+# 🗂️ COLEÇÕES FÍSICAS POR TRÁS DE UM ALIAS
+# =====================================================
+# A app lê sempre pelo nome lógico (ex.: "chatbot_passagem_ano"), que é um
+# alias para uma coleção física versionada. Trocar de modelo = preencher uma
+# coleção nova e mudar o alias numa só operação.
+def mapa_aliases(client):
+    return {a.alias_name: a.collection_name for a in client.get_aliases().aliases}
+
+
+def resolver_colecao(client, nome):
+    """Nome da coleção física por trás de `nome` (alias ou coleção antiga), ou None."""
+    aliases = mapa_aliases(client)
+    if nome in aliases:
+        return aliases[nome]
+    if nome in [c.name for c in client.get_collections().collections]:
+        return nome
+    return None
+
+
+def nome_versionado(nome, etiqueta=None):
+    sufixo = datetime.now().strftime("%Y%m%d%H%M%S")
+    return f"{nome}__{etiqueta}__{sufixo}" if etiqueta else f"{nome}__{sufixo}"
+
+
+def criar_colecao(client, nome, dim, esquema=ESQUEMA_PAYLOAD, perfil=None):
+    config = obter_perfil(perfil)
+    client.create_collection(
+        collection_name=nome,
+        vectors_config=models.VectorParams(size=dim, distance=models.Distance.COSINE, on_disk=config["on_disk"]),
+        hnsw_config=config["hnsw"],
+        quantization_config=config["quantizacao"],
+    )
+    garantir_indices(client, nome, esquema)
+
+
+# =====================================================
+# 🏷️ ÍNDICES DE PAYLOAD
+# =====================================================
+def modo_local(client):
+    """True no modo local (path=…), que ignora índices de payload."""
+    return isinstance(getattr(client, "_client", None), QdrantLocal)
+
+
+def garantir_indices(client, colecao, esquema=ESQUEMA_PAYLOAD):
+    """Cria os índices do esquema que faltem na coleção; devolve os campos criados."""
+    if not esquema or modo_local(client):
+        return []
+    existentes = client.get_collection(colecao).payload_schema or {}
+    criados = []
+    for campo, tipo in esquema.items():
+        if campo not in existentes:
+            client.create_payload_index(collection_name=colecao, field_name=campo, field_schema=tipo, wait=True)
+            criados.append(campo)
+    if criados:
+        print(f"🏷️ Índices de payload criados em '{colecao}': {', '.join(criados)}")
+    return criados
+
+
+def apontar_alias(client, alias, colecao):
+    """Muda o alias para `colecao` numa única operação atómica."""
+    operacoes = []
+    if alias in mapa_aliases(client):
+        operacoes.append(models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=alias)))
+    operacoes.append(
+        models.CreateAliasOperation(create_alias=models.CreateAlias(collection_name=colecao, alias_name=alias))
+    )
+    client.update_collection_aliases(change_aliases_operations=operacoes)
+
+
+def garantir_colecao(client, alias, dim, esquema=ESQUEMA_PAYLOAD):
+    """
+    Devolve a coleção física do alias, criando uma nova (e o alias) se não
+    existir nenhuma. Numa coleção já existente acrescenta os índices em falta.
+    """
+    fisica = resolver_colecao(client, alias)
+    if fisica is None:
+        fisica = nome_versionado(alias)
+        criar_colecao(client, fisica, dim, esquema)
+        apontar_alias(client, alias, fisica)
+        print(f"✨ Nova coleção criada! ('{alias}' → '{fisica}')")
+    else:
+        garantir_indices(client, fisica, esquema)
+    return fisica
+
+
+def recriar_colecao(client, alias, dim, esquema=ESQUEMA_PAYLOAD):
+    """Apaga o conteúdo da coleção atual do alias e deixa-a vazia com o mesmo nome."""
+    fisica = resolver_colecao(client, alias)
+    if fisica is not None:
+        client.delete_collection(fisica)
+    else:
+        fisica = nome_versionado(alias)
+    criar_colecao(client, fisica, dim, esquema)
+    if fisica != alias:
+        apontar_alias(client, alias, fisica)
+    return fisica
@@ -0,0 +1,161 @@
+# confirmacoes.py
+import os
+import time
+import threading
+from datetime import datetime
+
+from qdrant_client import models
+
+from colecoes import garantir_indices
+from identificadores import id_confirmacao
+
+COLLECTION_CONFIRMACOES = "confirmacoes_passagem_ano"
+# De quanto em quanto tempo se confere se outro processo (app e serviço lado a
+# lado, ou várias réplicas sobre o mesmo QDRANT_URL) acrescentou confirmações
+TTL_CONFIRMACOES_S = float(os.getenv("CHATBOT_CONFIRMACOES_TTL", "30"))
+
+
+# =====================================================
+# ✅ REGISTO DE CONFIRMADOS
+# =====================================================
+class RegistoConfirmacoes:
+    """
+    Conjunto de confirmados mantido em memória e espelhado numa coleção
+    própria com um ponto por utilizador (id derivado do nome).
+
+    Confirmar é um upsert idempotente e a lista ordenada só é recalculada
+    quando muda, por isso "quem vai" responde sem ir ao Qdrant. Outros
+    processos podem escrever na mesma coleção: passado `ttl_s`, uma contagem
+    dos pontos diz se o conjunto ficou para trás e, nesse caso, é relido
+    (só se acrescentam confirmações, por isso a contagem basta como geração).
+    `ao_mudar()` é chamado quando a releitura traz nomes novos.
+    """
+
+    def __init__(self, client, collection_name=COLLECTION_CONFIRMACOES, colecao_legado=None,
+                 ttl_s=TTL_CONFIRMACOES_S, ao_mudar=None):
+        self.client = client
+        self.collection_name = collection_name
+        self.ttl_s = ttl_s
+        self.ao_mudar = ao_mudar
+        self._nomes = set()
+        self._ordenados = ()
+        self._lock = threading.Lock()
+        self._conferido_em = 0.0
+        self._garantir_colecao()
+        self._carregar()
+        if not self._nomes and colecao_legado:
+            self._migrar_legado(colecao_legado)
+
+    @staticmethod
+    def _nome_valido(nome):
+        nome = str(nome or "").strip()
+        return nome if nome and nome.lower() != "none" else None
+
+    def _garantir_colecao(self):
+        existentes = [c.name for c in self.client.get_collections().collections]
+        if self.collection_name not in existentes:
+            # Só interessa o payload; o vetor é um marcador de dimensão 1
+            self.client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=models.VectorParams(size=1, distance=models.Distance.DOT),
+            )
+        garantir_indices(self.client, self.collection_name, {"user": models.PayloadSchemaType.KEYWORD})
+
+    def _percorrer(self, collection_name, filtro=None):
+        """Itera todos os payloads com paginação (sem o limite fixo de 500)."""
+        offset = None
+        while True:
+            pontos, offset = self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=filtro,
+                limit=1000,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            for ponto in pontos:
+                yield ponto.payload or {}
+            if offset is None:
+                break
+
+    def _carregar(self):
+        nomes = set()
+        for payload in self._percorrer(self.collection_name):
+            nome = self._nome_valido(payload.get("user"))
+            if nome:
+                nomes.add(nome)
+        with self._lock:
+            novos = nomes - self._nomes
+            self._nomes |= nomes
+            self._ordenados = tuple(sorted(self._nomes))
+        self._conferido_em = time.monotonic()
+        return bool(novos)
+
+    def _conferir(self):
+        """Passado o TTL, relê o conjunto se a coleção tiver mais pontos do que ele."""
+        if time.monotonic() - self._conferido_em < self.ttl_s:
+            return
+        try:
+            total = self.client.count(collection_name=self.collection_name, exact=True).count
+            if total == len(self._nomes):
+                self._conferido_em = time.monotonic()
+                return
+            if self._carregar() and self.ao_mudar:
+                self.ao_mudar()
+        except Exception as e:
+            print(f"⚠️ Erro ao atualizar confirmações: {e}")
+            self._conferido_em = time.monotonic()  # não insistir a cada pedido
+
+    def _migrar_legado(self, colecao_legado):
+        """Importa as confirmações antigas guardadas na coleção principal."""
+        filtro = models.Filter(
+            must=[models.FieldCondition(key="contexto", match=models.MatchValue(value="confirmacoes"))]
+        )
+        try:
+            # Só os marcadores de confirmação (sem "pergunta"); o resto é registo de conversa
+            nomes = {
+                self._nome_valido(p.get("user"))
+                for p in self._percorrer(colecao_legado, filtro)
+                if "pergunta" not in p
+            }
+        except Exception as e:
+            print(f"⚠️ Erro ao migrar confirmações antigas: {e}")
+            return
+        for nome in sorted(n for n in nomes if n):
+            self.confirmar(nome)
+        if self._nomes:
+            print(f"✅ {len(self._nomes)} confirmações migradas para '{self.collection_name}'.")
+
+    def confirmar(self, nome):
+        """Regista a presença; devolve True se o nome ainda não estava na lista."""
+        nome = self._nome_valido(nome)
+        self._conferir()
+        if not nome or nome in self._nomes:
+            return False
+        self.client.upsert(
+            collection_name=self.collection_name,
+            points=[
+                models.PointStruct(
+                    id=id_confirmacao(nome),
+                    vector=[1.0],
+                    payload={"user": nome, "confirmado_em": datetime.now().isoformat(timespec="seconds")},
+                )
+            ],
+        )
+        with self._lock:
+            self._nomes.add(nome)
+            self._ordenados = tuple(sorted(self._nomes))
+        return True
+
+    def confirmados(self):
+        """Lista ordenada de confirmados (pré-calculada)."""
+        self._conferir()
+        return self._ordenados
+
+    def __contains__(self, nome):
+        self._conferir()
+        return nome in self._nomes
+
+    def __len__(self):
+        self._conferir()
+        return len(self._nomes)
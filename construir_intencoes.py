@@ -0,0 +1,30 @@
+# construir_intencoes.py
+# Passo de build: grava o artefacto com a matriz de intenções para que o
+# arranque da app não precise de codificar nenhuma frase. Correr sempre que
+# INTENCOES_BASE, intencoes.json ou o modelo mudarem (a app também o refaz
+# sozinha se detetar que está desatualizado). O artefacto do modelo por
+# omissão (intencoes_centroides.npy/.json) vai para o git, para um checkout
+# novo arrancar sem codificar; os de outros CHATBOT_MODELO levam a assinatura
+# no nome e são ignorados.
+import os
+import time
+
+from intencoes import carregar_intencoes
+from motor_intencoes import MotorIntencoes, assinatura_intencoes, guardar_artefacto, path_artefacto
+from recursos import obter_modelo
+
+# O mesmo modelo que a app vai usar, senão a assinatura nunca coincide
+MODEL_NAME = os.environ.get("CHATBOT_MODELO", "intfloat/multilingual-e5-base")
+
+intencoes = carregar_intencoes()
+total_frases = sum(len(v) for v in intencoes.values())
+print(f"🧭 {len(intencoes)} intenções, {total_frases} frases de exemplo")
+
+inicio = time.perf_counter()
+motor = MotorIntencoes.a_partir_de_frases(obter_modelo(MODEL_NAME), intencoes)
+assinatura = assinatura_intencoes(intencoes, MODEL_NAME)
+path = path_artefacto(MODEL_NAME, assinatura)
+guardar_artefacto(motor, assinatura, MODEL_NAME, path=path)
+
+print(f"✅ Artefacto gravado em '{path}.npy' em {time.perf_counter() - inicio:.1f}s "
+      f"(matriz {motor.matriz.shape[0]}x{motor.matriz.shape[1]})")
@@ -0,0 +1,181 @@
+# diario.py
+import os
+import json
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem locks entre processos (um só processo Streamlit)
+    fcntl = None
+
+
+@contextmanager
+def bloqueio(path, exclusivo=True):
+    """flock partilhado ou exclusivo num ficheiro de lock, entre processos."""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusivo else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# Número de sequência: em cada linha do diário e, no snapshot, o da última
+# linha que ele já inclui
+CHAVE_SEQ = "_seq"
+
+
+# =====================================================
+# 📓 DIÁRIO APPEND-ONLY COM SNAPSHOT
+# =====================================================
+class Diario:
+    """
+    Estado persistido como um snapshot JSON mais um diário JSONL só de
+    acrescentos. Cada alteração é uma linha escrita com O_APPEND numa única
+    chamada (custo O(1), sem reescrever o ficheiro), sob um lock exclusivo
+    partilhado por todos os processos. Cada processo mantém a vista em memória
+    e só lê as linhas novas que outros escreveram entretanto.
+
+    A compactação grava o snapshot e troca o diário por um vazio, ambos com
+    tmp + os.replace; os outros processos notam o novo inode e recarregam.
+    As duas trocas não são atómicas em conjunto: cada linha leva um número de
+    sequência e o snapshot o da última que inclui, e ao repetir o diário as
+    linhas até esse número são saltadas — uma queda entre as duas trocas não
+    aplica a mesma linha duas vezes.
+
+    `ao_carregar(snapshot)` repõe a vista a partir do snapshot e
+    `ao_aplicar(registo)` aplica uma linha do diário — têm de ser
+    determinísticos, porque todos os processos os repetem pela mesma ordem.
+    """
+
+    def __init__(self, path_snapshot, path_diario, ao_carregar, ao_aplicar, compactar_cada=1000):
+        self.path_snapshot = path_snapshot
+        self.path_diario = path_diario
+        self.path_lock = path_diario + ".lock"
+        self.ao_carregar = ao_carregar
+        self.ao_aplicar = ao_aplicar
+        self.compactar_cada = compactar_cada
+        self.carregado = False
+        self.linhas = 0       # linhas no diário desde a última compactação
+        self._offset = 0
+        self._inode = None
+        self._seq = 0         # sequência da última linha aplicada
+
+    def _lock(self, exclusivo):
+        return bloqueio(self.path_lock, exclusivo)
+
+    def _stat_diario(self):
+        try:
+            st = os.stat(self.path_diario)
+            return st.st_ino, st.st_size
+        except FileNotFoundError:
+            return None, 0
+
+    def _ler_snapshot(self):
+        try:
+            # utf-8-sig: snapshots antigos foram gravados com BOM
+            with open(self.path_snapshot, encoding="utf-8-sig") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _ler_desde(self, offset):
+        """Aplica as linhas completas a partir de `offset`; devolve o novo offset."""
+        try:
+            with open(self.path_diario, "rb") as f:
+                f.seek(offset)
+                dados = f.read()
+        except FileNotFoundError:
+            return offset
+        fim = dados.rfind(b"\n") + 1  # uma linha a meio (escritor sem lock) fica para a próxima
+        for linha in dados[:fim].splitlines():
+            if not linha.strip():
+                continue
+            try:
+                registo = json.loads(linha)
+            except json.JSONDecodeError:
+                print(f"⚠️ Linha inválida no diário '{self.path_diario}' ignorada.")
+                continue
+            seq = registo.pop(CHAVE_SEQ, None)
+            if seq is not None:
+                if seq <= self._seq:
+                    continue  # já incluída no snapshot
+                self._seq = seq
+            self.ao_aplicar(registo)
+            self.linhas += 1
+        return offset + fim
+
+    def _recarregar(self):
+        snapshot = self._ler_snapshot()
+        self._seq = snapshot.pop(CHAVE_SEQ, 0) if isinstance(snapshot, dict) else 0
+        self.ao_carregar(snapshot)
+        self.linhas = 0
+        self._inode, _ = self._stat_diario()
+        self._offset = self._ler_desde(0)
+        self.carregado = True
+
+    def _sincronizar(self):
+        inode, tamanho = self._stat_diario()
+        if not self.carregado or inode != self._inode:
+            self._recarregar()
+        elif tamanho > self._offset:
+            self._offset = self._ler_desde(self._offset)
+
+    def sincronizar(self):
+        """Traz a vista em memória ao estado do disco (barato se nada mudou)."""
+        inode, tamanho = self._stat_diario()
+        if self.carregado and inode == self._inode and tamanho == self._offset:
+            return
+        with self._lock(exclusivo=False):
+            self._sincronizar()
+
+    def transacao(self, decidir):
+        """
+        Sob lock exclusivo: sincroniza, chama `decidir()` (que lê a vista já
+        atualizada e devolve o registo a escrever, ou None) e acrescenta-o.
+        """
+        with self._lock(exclusivo=True):
+            self._sincronizar()
+            registo = decidir()
+            if registo is None:
+                return None
+            seq = self._seq + 1
+            linha = (json.dumps({CHAVE_SEQ: seq, **registo}, ensure_ascii=False) + "\n").encode("utf-8")
+            fd = os.open(self.path_diario, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, linha)
+            finally:
+                os.close(fd)
+            if self._inode is None:
+                self._inode, _ = self._stat_diario()
+            self._offset += len(linha)
+            self._seq = seq
+            self.ao_aplicar(registo)
+            self.linhas += 1
+        return registo
+
+    def compactar(self, obter_estado):
+        """Grava `obter_estado()` como snapshot e recomeça o diário vazio (ambos atómicos)."""
+        with self._lock(exclusivo=True):
+            # O que outros processos acrescentaram entra no snapshot antes de o diário ser trocado
+            self._sincronizar()
+            estado = {**obter_estado(), CHAVE_SEQ: self._seq}
+            tmp = self.path_snapshot + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(estado, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path_snapshot)
+            tmp = self.path_diario + ".tmp"
+            open(tmp, "wb").close()
+            os.replace(tmp, self.path_diario)
+            self._inode, _ = self._stat_diario()
+            self._offset = 0
+            self.linhas = 0
+
+    def talvez_compactar(self, obter_estado):
+        if self.linhas >= self.compactar_cada:
+            self.compactar(obter_estado)
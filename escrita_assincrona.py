@@ -0,0 +1,82 @@
+# escrita_assincrona.py
+import time
+import queue
+import atexit
+import threading
+
+_FIM = object()
+
+
+# =====================================================
+# 📝 ESCRITA EM SEGUNDO PLANO (write-behind)
+# =====================================================
+class EscritorAssincrono:
+    """
+    Fila limitada servida por uma thread que agrupa registos e chama
+    `escrever_lote(registos)` a cada `max_lote` registos ou `intervalo_ms`
+    milissegundos, o que vier primeiro. Se a fila encher, `enviar` bloqueia
+    (backpressure) em vez de perder mensagens. No fim do processo a fila é
+    despejada.
+    """
+
+    def __init__(self, escrever_lote, max_lote=32, intervalo_ms=200, max_fila=1000, nome="escritor"):
+        self.escrever_lote = escrever_lote
+        self.max_lote = max_lote
+        self.intervalo = intervalo_ms / 1000
+        self._fila = queue.Queue(maxsize=max_fila)
+        self._thread = threading.Thread(target=self._ciclo, name=nome, daemon=True)
+        self._thread.start()
+        atexit.register(self.parar)
+
+    def enviar(self, registo):
+        """Coloca um registo na fila (retorna logo, salvo se a fila estiver cheia)."""
+        if not self._thread.is_alive():
+            # Já parado (ex.: durante o atexit) — escreve de forma síncrona
+            self._escrever([registo])
+            return
+        self._fila.put(registo)
+
+    def esvaziar(self):
+        """Bloqueia até todos os registos enviados estarem escritos."""
+        self._fila.join()
+
+    def parar(self):
+        """Escreve o que falta e termina a thread."""
+        if self._thread.is_alive():
+            self._fila.put(_FIM)
+            self._thread.join()
+
+    def pendentes(self):
+        return self._fila.qsize()
+
+    def _escrever(self, lote):
+        try:
+            self.escrever_lote(lote)
+        except Exception as e:
+            print(f"❌ Erro na escrita em lote ({len(lote)} registos): {e}")
+
+    def _ciclo(self):
+        terminar = False
+        while not terminar:
+            primeiro = self._fila.get()
+            if primeiro is _FIM:
+                self._fila.task_done()
+                break
+            lote = [primeiro]
+            limite = time.monotonic() + self.intervalo
+            while len(lote) < self.max_lote:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    item = self._fila.get(timeout=restante)
+                except queue.Empty:
+                    break
+                if item is _FIM:
+                    terminar = True
+                    self._fila.task_done()
+                    break
+                lote.append(item)
+            self._escrever(lote)
+            for _ in lote:
+                self._fila.task_done()
@@ -0,0 +1,25 @@
+# evento.py
+# Dados do evento e ficheiros JSON de configuração. Módulo leve (sem modelo
+# nem Qdrant), para a app em modo cliente do servico.py o poder importar.
+import json
+
+EVENTO_OMISSAO = {
+    "local": "Casa do Miguel, Porto",
+    "hora": "21h00",
+    "wifi": "CasaDoMiguel2025",
+    "dress_code": "casual elegante",
+    "trazer": ["boa disposição"]
+}
+
+# =====================================================
+# 🔧 Utilitários
+# =====================================================
+def carregar_json(path: str, default=None):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return default if default is not None else {}
+
+def carregar_evento(path: str = "event.json"):
+    return carregar_json(path, default=EVENTO_OMISSAO)
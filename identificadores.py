@@ -0,0 +1,26 @@
+# identificadores.py
+import uuid
+
+from normalizacao import normalizar
+
+# Namespace fixo do projeto: o mesmo conteúdo gera sempre o mesmo id
+NAMESPACE_CHATBOT = uuid.uuid5(uuid.NAMESPACE_URL, "chatbot-passagem-ano")
+
+
+def id_ponto(*partes):
+    """UUID5 estável derivado do conteúdo (upsert com o mesmo id = deduplicação)."""
+    return str(uuid.uuid5(NAMESPACE_CHATBOT, "\x1f".join(str(p) for p in partes)))
+
+
+def id_mensagem(user, contexto, pergunta):
+    """Uma entrada por (utilizador, contexto, pergunta normalizada) no registo de conversa."""
+    return id_ponto("mensagem", user, contexto, normalizar(pergunta))
+
+
+def id_semente(contexto, pergunta):
+    """Um ponto semeado por (contexto, pergunta normalizada): as variantes colapsam no mesmo id."""
+    return id_ponto("semente", contexto, normalizar(pergunta))
+
+
+def id_confirmacao(nome):
+    return id_ponto("confirmacao", nome)
@@ -0,0 +1,122 @@
+# indice_memoria.py
+import threading
+
+import numpy as np
+
+from motor_intencoes import normalizar_linhas
+
+
+# =====================================================
+# 🧮 ÍNDICE VETORIAL EM MEMÓRIA (força bruta)
+# =====================================================
+class IndiceMemoria:
+    """
+    Cópia em memória da coleção para bases pequenas: uma matriz de vetores
+    normalizados (cosseno = produto interno), os payloads por linha e uma
+    máscara booleana por `contexto`, mantida a cada escrita, para o filtro
+    não custar nada na pesquisa.
+
+    Com poucos milhares de pontos um produto matriz-vetor é mais rápido do que
+    a ida ao Qdrant local. `dtype="float16"` reduz a memória para metade.
+    """
+
+    def __init__(self, dim, dtype="float32", capacidade=1024):
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self._matriz = np.zeros((capacidade, dim), dtype=self.dtype)
+        self._ids = []
+        self._linha_de = {}
+        self._payloads = []
+        self._mascaras = {}  # contexto → máscara booleana (mesma capacidade da matriz)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _crescer(self, minimo):
+        capacidade = len(self._matriz)
+        if minimo <= capacidade:
+            return
+        while capacidade < minimo:
+            capacidade *= 2
+        matriz = np.zeros((capacidade, self.dim), dtype=self.dtype)
+        matriz[: len(self._ids)] = self._matriz[: len(self._ids)]
+        self._matriz = matriz
+        for contexto, mascara in self._mascaras.items():
+            nova = np.zeros(capacidade, dtype=bool)
+            nova[: len(mascara)] = mascara
+            self._mascaras[contexto] = nova
+
+    def adicionar(self, ids, vetores, payloads):
+        """Upsert: um id já presente substitui a sua linha (e muda de contexto se for o caso)."""
+        vetores = normalizar_linhas(vetores).astype(self.dtype)
+        with self._lock:
+            self._crescer(len(self._ids) + len(ids))
+            for pid, vetor, payload in zip(ids, vetores, payloads):
+                payload = payload or {}
+                linha = self._linha_de.get(pid)
+                if linha is None:
+                    linha = len(self._ids)
+                    self._linha_de[pid] = linha
+                    self._ids.append(pid)
+                    self._payloads.append(payload)
+                else:
+                    antigo = self._payloads[linha].get("contexto", "geral")
+                    self._mascaras[antigo][linha] = False
+                    self._payloads[linha] = payload
+                self._matriz[linha] = vetor
+                contexto = payload.get("contexto", "geral")
+                if contexto not in self._mascaras:
+                    self._mascaras[contexto] = np.zeros(len(self._matriz), dtype=bool)
+                self._mascaras[contexto][linha] = True
+
+    def procurar(self, vetor, contexto=None, top_k=3):
+        """[(score, payload, id), ...] por score decrescente, como o `search` do Qdrant."""
+        consulta = normalizar_linhas(vetor).reshape(-1).astype(self.dtype)
+        with self._lock:
+            n = len(self._ids)
+            if contexto is None:
+                linhas = np.arange(n)
+            elif contexto in self._mascaras:
+                linhas = np.flatnonzero(self._mascaras[contexto][:n])
+            else:
+                return []
+            if not len(linhas):
+                return []
+            matriz = self._matriz[:n] if contexto is None else self._matriz[linhas]
+            scores = (matriz @ consulta).astype(np.float32)
+            k = min(top_k, len(linhas))
+            melhores = np.argpartition(-scores, k - 1)[:k]
+            melhores = melhores[np.argsort(-scores[melhores], kind="stable")]
+            return [(float(scores[i]), self._payloads[linhas[i]], self._ids[linhas[i]]) for i in melhores]
+
+    def obter_vetor(self, pid):
+        """Vetor (normalizado) do ponto, ou None se não estiver no índice."""
+        with self._lock:
+            linha = self._linha_de.get(pid)
+            return None if linha is None else self._matriz[linha].astype(np.float32)
+
+    def limpar(self):
+        with self._lock:
+            self._matriz[:] = 0
+            self._ids.clear()
+            self._linha_de.clear()
+            self._payloads.clear()
+            self._mascaras.clear()
+
+    def sincronizar(self, client, collection_name, tamanho_pagina=1000):
+        """Carrega a coleção inteira (com vetores) por páginas de scroll."""
+        offset = None
+        while True:
+            pontos, offset = client.scroll(
+                collection_name=collection_name,
+                limit=tamanho_pagina,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            if pontos:
+                self.adicionar([p.id for p in pontos], [p.vector for p in pontos], [p.payload for p in pontos])
+            if offset is None:
+                break
+        return len(self)
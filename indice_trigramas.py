@@ -0,0 +1,90 @@
+# indice_trigramas.py
+import math
+import difflib
+
+import numpy as np
+
+
+def trigramas(texto):
+    """Trigramas de caracteres com margens (" ab", "abc", "bc "), para textos curtos também terem alguns."""
+    t = f"  {texto} "
+    return {t[i:i + 3] for i in range(len(t) - 2)}
+
+
+# =====================================================
+# 🔡 ÍNDICE DE TRIGRAMAS PARA PROCURA APROXIMADA
+# =====================================================
+class IndiceTrigramas:
+    """
+    Listas invertidas trigrama → chaves, para encontrar uma chave parecida
+    sem comparar com todas.
+
+    1. Contagem: os trigramas partilhados com cada chave saem de um único
+       `np.bincount` sobre as listas dos trigramas da pergunta.
+    2. Filtros: `SequenceMatcher.ratio() > limiar` exige tamanhos próximos,
+       e uma chave semelhante partilha pelo menos `fracao_minima` dos trigramas.
+    3. Verificação: o rácio do difflib só é calculado para os candidatos que
+       sobram, pela ordem em que as chaves foram adicionadas, e ganha o
+       primeiro acima do limiar — o mesmo que percorrer a memória toda.
+    """
+
+    def __init__(self, limiar=0.8, fracao_minima=0.3):
+        self.limiar = limiar
+        self.fracao_minima = fracao_minima
+        self._listas = {}      # trigrama → [índice da chave]
+        self._arrays = {}      # cache numpy das listas (invalidada quando a lista cresce)
+        self._chaves = []
+        self._tamanhos = []
+        self._tamanhos_np = None
+        self._posicao = {}     # chave → índice
+
+    def __len__(self):
+        return len(self._chaves)
+
+    def __contains__(self, chave):
+        return chave in self._posicao
+
+    def adicionar(self, chave):
+        if chave in self._posicao:
+            return
+        i = len(self._chaves)
+        self._posicao[chave] = i
+        self._chaves.append(chave)
+        self._tamanhos.append(len(chave))
+        self._tamanhos_np = None
+        for t in trigramas(chave):
+            self._listas.setdefault(t, []).append(i)
+            self._arrays.pop(t, None)
+
+    def _lista(self, t):
+        arr = self._arrays.get(t)
+        if arr is None:
+            arr = self._arrays[t] = np.fromiter(self._listas[t], dtype=np.int32)
+        return arr
+
+    def candidatos(self, texto):
+        """Índices das chaves que passam os filtros, pela ordem de inserção."""
+        tris = [t for t in trigramas(texto) if t in self._listas]
+        minimo = max(1, math.ceil(len(trigramas(texto)) * self.fracao_minima))
+        if len(tris) < minimo:
+            return []
+        n = len(self._chaves)
+        contagem = np.bincount(np.concatenate([self._lista(t) for t in tris]), minlength=n)
+        if self._tamanhos_np is None:
+            self._tamanhos_np = np.asarray(self._tamanhos, dtype=np.int32)
+        # ratio = 2M / (n + m) ≤ 2·min(n, m) / (n + m)
+        menor = len(texto) * self.limiar / (2 - self.limiar)
+        maior = len(texto) * (2 - self.limiar) / self.limiar
+        ok = (contagem >= minimo) & (self._tamanhos_np >= menor) & (self._tamanhos_np <= maior)
+        return np.flatnonzero(ok)
+
+    def procurar(self, texto):
+        """Primeira chave (ordem de inserção) com rácio do difflib acima do limiar, ou None."""
+        exata = self._posicao.get(texto)
+        for i in self.candidatos(texto):
+            if i == exata:
+                return texto  # nenhuma anterior passou; a própria tem rácio 1
+            sm = difflib.SequenceMatcher(None, self._chaves[i], texto)
+            if sm.real_quick_ratio() > self.limiar and sm.quick_ratio() > self.limiar and sm.ratio() > self.limiar:
+                return self._chaves[i]
+        return texto if exata is not None else None
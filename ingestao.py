@@ -0,0 +1,205 @@
+# ingestao.py
+import json
+import time
+import random
+from itertools import islice
+
+from qdrant_client import models
+
+from escrita_assincrona import EscritorAssincrono
+from identificadores import id_semente
+from normalizacao import normalizar
+
+
+# =====================================================
+# 📄 DATASETS DECLARADOS EM FICHEIROS
+# =====================================================
+def carregar_dataset(path):
+    """
+    Lê um dataset de `dados/*.json`. Cada bloco tem `contexto` e ou
+    `perguntas` × `respostas` (com `sinonimos` opcionais) ou `pares` explícitos.
+    """
+    with open(path, encoding="utf-8") as f:
+        dataset = json.load(f)
+    dataset.setdefault("nome", path)
+    return dataset
+
+
+# =====================================================
+# 🔗 ETAPAS DO PIPELINE (geradores)
+# =====================================================
+def fonte(dataset):
+    """Pares (pergunta, resposta, contexto) base, já com as substituições de sinónimos."""
+    for bloco in dataset["blocos"]:
+        contexto = bloco["contexto"]
+        if "pares" in bloco:
+            for q, r in bloco["pares"]:
+                yield q, r, contexto
+            continue
+        perguntas = list(bloco["perguntas"])
+        for q in bloco["perguntas"]:
+            for a, b in bloco.get("sinonimos", []):
+                if a in q:
+                    perguntas.append(q.replace(a, b))
+        for q in perguntas:
+            for r in bloco["respostas"]:
+                yield q, r, contexto
+
+
+def personalizar(pares, nomes, rng):
+    """Preenche {nome} nas respostas com um convidado ao acaso."""
+    for q, r, ctx in pares:
+        if "{nome}" in r and nomes:
+            r = r.format(nome=rng.choice(nomes))
+        yield q, r, ctx
+
+
+def agrupar(pares, contagem=None):
+    """
+    Normaliza as perguntas com a mesma função da app e junta tudo o que
+    colapsa no mesmo texto: um ponto por (contexto, pergunta normalizada),
+    com a lista de respostas distintas. Só devolve grupos no fim de `pares`,
+    e a memória cresce com o número de perguntas únicas, não com o de pares —
+    por isso a ingestão chama-a dataset a dataset.
+    """
+    grupos = {}
+    for q, r, ctx in pares:
+        if contagem is not None:
+            contagem["pares"] += 1
+        pergunta = normalizar(q)
+        if not pergunta:
+            continue
+        _, _, respostas = grupos.setdefault(id_semente(ctx, pergunta), (pergunta, ctx, []))
+        if r not in respostas:
+            respostas.append(r)
+    for pid, (pergunta, ctx, respostas) in grupos.items():
+        yield pid, pergunta, respostas, ctx
+
+
+def em_lotes(itens, tamanho):
+    itens = iter(itens)
+    while lote := list(islice(itens, tamanho)):
+        yield lote
+
+
+def pares_do_dataset(dataset):
+    """Fonte → personalizar, com a semente própria do dataset."""
+    rng = random.Random(dataset.get("semente"))
+    return personalizar(fonte(dataset), dataset.get("nomes", []), rng)
+
+
+# =====================================================
+# 🚚 INGESTÃO: codificar em lote ‖ upsert em lote
+# =====================================================
+def ingerir(datasets, client, collection_name, codificar_lote, tamanho_lote=64, lotes_em_voo=4):
+    """
+    Corre o pipeline completo sobre `datasets`. O thread principal codifica
+    lotes enquanto um escritor em segundo plano faz os upserts; a fila entre
+    os dois tem no máximo `lotes_em_voo` lotes e os pares são agrupados
+    dataset a dataset, por isso a memória fica limitada ao maior dataset.
+    Devolve estatísticas com o débito em pares/s.
+    """
+    erros = []
+    escritos = set()  # ids já gravados nesta ingestão (só os ids, sem as respostas)
+
+    def juntar(ponto, respostas_anteriores):
+        respostas = list(dict.fromkeys(respostas_anteriores + ponto.payload["respostas"]))
+        ponto.payload.update(respostas=respostas, resposta=respostas[0])
+
+    def juntar_repetidos(pontos):
+        """Pergunta repetida entre datasets: um só ponto, com as respostas de todas as ocorrências."""
+        por_id = {}
+        for p in pontos:
+            if p.id in por_id:
+                juntar(p, por_id[p.id].payload["respostas"])
+            por_id[p.id] = p
+        # Ocorrências de lotes anteriores: o escritor grava por ordem, por isso já estão na coleção
+        ids = [pid for pid in por_id if pid in escritos]
+        if ids:
+            for anterior in client.retrieve(collection_name, ids=ids, with_payload=True):
+                juntar(por_id[anterior.id], (anterior.payload or {}).get("respostas", []))
+        return list(por_id.values())
+
+    def upsert(lotes):
+        try:
+            pontos = juntar_repetidos([p for lote in lotes for p in lote])
+            client.upsert(collection_name=collection_name, points=pontos)
+            escritos.update(p.id for p in pontos)
+        except Exception as e:
+            erros.append(e)
+            raise
+
+    escritor = EscritorAssincrono(upsert, max_lote=1, intervalo_ms=0, max_fila=lotes_em_voo, nome="ingestao")
+    inicio = time.perf_counter()
+    t_codificar = 0.0
+    contagem = {"pares": 0}
+
+    def grupos():
+        for dataset in datasets:
+            print(f"📄 Dataset '{dataset['nome']}'")
+            yield from agrupar(pares_do_dataset(dataset), contagem)
+
+    for lote in em_lotes(grupos(), tamanho_lote):
+        t0 = time.perf_counter()
+        vetores = codificar_lote([q for _, q, _, _ in lote])
+        t_codificar += time.perf_counter() - t0
+        escritor.enviar([
+            models.PointStruct(
+                id=pid,
+                vector=vetor.tolist(),
+                # "resposta" mantém-se para quem só lê uma; "respostas" guarda a variedade
+                payload={"pergunta": q, "respostas": respostas, "resposta": respostas[0], "contexto": ctx},
+            )
+            for (pid, q, respostas, ctx), vetor in zip(lote, vetores)
+        ])
+
+    escritor.parar()
+    duracao = time.perf_counter() - inicio
+    return {
+        "pares": contagem["pares"],
+        "pontos": len(escritos),
+        "segundos": duracao,
+        "pares_por_segundo": contagem["pares"] / duracao if duracao else 0.0,
+        "segundos_a_codificar": t_codificar,
+        "erros": len(erros),
+    }
+
+
+# =====================================================
+# 🔁 RE-EMBEDDING DA COLEÇÃO (mesmos ids, novos vetores)
+# =====================================================
+def percorrer_colecao(client, collection_name, tamanho_pagina=256, offset=None):
+    """Itera a coleção por páginas: devolve (pontos, próximo offset) sem vetores."""
+    while True:
+        pontos, offset = client.scroll(
+            collection_name=collection_name,
+            limit=tamanho_pagina,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False,
+        )
+        if pontos:
+            yield pontos, offset
+        if offset is None:
+            break
+
+
+def reindexar(client, collection_name, codificar_lote, tamanho_lote=256):
+    """Volta a codificar o campo `pergunta` de todos os pontos, página a página."""
+    inicio = time.perf_counter()
+    total = 0
+    for pontos, _ in percorrer_colecao(client, collection_name, tamanho_pagina=tamanho_lote):
+        com_pergunta = [p for p in pontos if (p.payload or {}).get("pergunta")]
+        if not com_pergunta:
+            continue
+        vetores = codificar_lote([p.payload["pergunta"] for p in com_pergunta])
+        client.upsert(
+            collection_name=collection_name,
+            points=[
+                models.PointStruct(id=p.id, vector=v.tolist(), payload=p.payload)
+                for p, v in zip(com_pergunta, vetores)
+            ],
+        )
+        total += len(com_pergunta)
+    duracao = time.perf_counter() - inicio
+    return {"pares": total, "segundos": duracao, "pares_por_segundo": total / duracao if duracao else 0.0}
@@ -0,0 +1,59 @@
+# intencoes.py
+import json
+
+INTENCOES_PATH = "intencoes.json"
+
+# =====================================================
+# 🧭 FRASES DE EXEMPLO POR INTENÇÃO
+# =====================================================
+INTENCOES_BASE = {
+    "saudacao": ["olá", "bom dia", "boa tarde", "boa noite", "como estás"],
+    "festa": ["onde é a festa", "hora da festa", "quem vai", "vai haver música", "DJ", "vai ser no porto"],
+    "comida": ["vai haver jantar", "o que vai haver para comer", "há sobremesas", "menu"],
+    "bebida": ["vai haver cerveja", "há vinho", "cocktails", "shots", "champanhe"],
+    "roupa": ["dress code", "o que vestir", "cor do ano", "amarelo"],
+    "futebol": ["benfica", "porto", "sporting", "futebol", "jogo", "ganhar"],
+    "piadas": ["conta uma piada", "faz-me rir", "piada", "anedota"],
+    "confirmacoes": ["quem vai", "a jojo vai", "o miguel confirmou", "quantas pessoas vão"],
+    "logistica": ["há estacionamento", "transporte", "como chegar", "longe", "uber"]
+}
+
+# Intenções sem contexto próprio na coleção: os pontos semeados destas
+# perguntas (dados/*.json) estão em "festa", e é esse contexto que a
+# pesquisa tem de filtrar e o registo tem de gravar
+CONTEXTO_DA_INTENCAO = {
+    "local": "festa",
+    "hora": "festa",
+    "fogo": "festa",
+    "comida": "festa",
+    "bebida": "festa",
+}
+
+
+def contexto_da_intencao(intencao):
+    """Contexto da coleção que corresponde à intenção detetada."""
+    return CONTEXTO_DA_INTENCAO.get(intencao, intencao)
+
+
+def carregar_intencoes(path=INTENCOES_PATH):
+    """
+    INTENCOES_BASE completado com as frases de `intencoes.json`: intenções
+    existentes ganham os exemplos extra e as novas são acrescentadas.
+    """
+    intencoes = {k: list(v) for k, v in INTENCOES_BASE.items()}
+    try:
+        with open(path, "rb") as f:
+            bruto = f.read()
+    except OSError:
+        return intencoes
+    # O ficheiro original foi gravado em Windows-1252, não em UTF-8
+    for codificacao in ("utf-8-sig", "cp1252"):
+        try:
+            extra = json.loads(bruto.decode(codificacao))
+            break
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            extra = {}
+    for nome, frases in extra.items():
+        destino = intencoes.setdefault(nome, [])
+        destino.extend(f for f in frases if f not in destino)
+    return intencoes
@@ -1,33 +1,85 @@
-﻿import json, os, difflib
+﻿import os, threading
+
+from diario import Diario
+from indice_trigramas import IndiceTrigramas
 
 MEMORY_PATH = "memory.json"
+DIARIO_PATH = "memory.jsonl"
+COMPACTAR_CADA = int(os.getenv("CHATBOT_MEMORIA_COMPACTAR", "1000"))
+LIMIAR_SEMELHANCA = 0.8
+
+# =====================================================
+# 🗂️ Estado em memória + diário em disco
+# =====================================================
+# memory.json é o snapshot; cada pergunta aprendida acrescenta uma linha a
+# memory.jsonl em vez de reescrever o ficheiro todo. O diário é compactado
+# para o snapshot a cada COMPACTAR_CADA linhas.
+_lock = threading.Lock()
+_memoria = {}
+_indice = IndiceTrigramas(limiar=LIMIAR_SEMELHANCA)
+
+def _ao_carregar(snapshot):
+    global _memoria, _indice
+    _memoria = snapshot if isinstance(snapshot, dict) else {}
+    _indice = IndiceTrigramas(limiar=LIMIAR_SEMELHANCA)
+    for chave in _memoria:
+        _indice.adicionar(chave)
+
+def _ao_aplicar(registo):
+    """Aplica uma linha do diário: {"chave", "pergunta", "resposta"}."""
+    chave, pergunta, resposta = registo["chave"], registo["pergunta"], registo["resposta"]
+    entrada = _memoria.get(chave)
+    if entrada is None:
+        _memoria[chave] = {
+            "perguntas": [pergunta],
+            "resposta": resposta,
+            "vezes": 1
+        }
+        _indice.adicionar(chave)
+        return
+    entrada["vezes"] += 1
+    if resposta not in entrada["resposta"]:
+        # Mantém a última resposta como referência
+        entrada["resposta"] = resposta
+    if pergunta not in entrada["perguntas"]:
+        entrada["perguntas"].append(pergunta)
+
+diario = Diario(MEMORY_PATH, DIARIO_PATH, _ao_carregar, _ao_aplicar, compactar_cada=COMPACTAR_CADA)
 
 # =====================================================
 # 🔧 Funções auxiliares
 # =====================================================
 
+def _memoria_carregada():
+    """Vista em memória, com as linhas que outros processos escreveram entretanto."""
+    diario.sincronizar()
+    return _memoria
+
 def carregar_memoria():
-    """Lê o ficheiro de memória local."""
-    if not os.path.exists(MEMORY_PATH):
-        return {}
-    try:
-        with open(MEMORY_PATH, encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        return {}
+    """Memória atual (snapshot + diário)."""
+    with _lock:
+        return _memoria_carregada()
 
-def guardar_memoria(mem):
-    """Guarda o dicionário de memória no ficheiro."""
-    with open(MEMORY_PATH, "w", encoding="utf-8") as f:
-        json.dump(mem, f, ensure_ascii=False, indent=2)
+def guardar_memoria(mem=None):
+    """Compacta: grava a memória no snapshot (escrita atómica) e esvazia o diário."""
+    with _lock:
+        diario.compactar(lambda: _memoria if mem is None else mem)
+        if mem is not None and mem is not _memoria:
+            _ao_carregar(mem)
 
-def encontrar_pergunta_semelhante(pergunta, mem):
-    """Procura se já existe uma pergunta semelhante na memória."""
-    for key in mem.keys():
-        similarity = difflib.SequenceMatcher(None, key, pergunta).ratio()
-        if similarity > 0.8:
-            return key
-    return None
+def encontrar_pergunta_semelhante(pergunta, mem=None):
+    """
+    Procura se já existe uma pergunta semelhante na memória (rácio do difflib
+    acima de 0.8), pelo índice de trigramas em vez de comparar com todas.
+    """
+    if mem is None or mem is _memoria:
+        with _lock:
+            _memoria_carregada()
+            return _indice.procurar(pergunta)
+    indice = IndiceTrigramas(limiar=LIMIAR_SEMELHANCA)
+    for chave in mem:
+        indice.adicionar(chave)
+    return indice.procurar(pergunta)
 
 # =====================================================
 # 🧠 Lógica principal
@@ -35,35 +87,26 @@ def encontrar_pergunta_semelhante(pergunta, mem):
 
 def atualizar_memoria(pergunta, resposta):
     """
-    Atualiza o ficheiro memory.json com novas perguntas e respostas.
+    Regista uma pergunta e resposta (uma linha no diário).
     Se uma pergunta semelhante já existir, aumenta o contador.
     """
-    mem = carregar_memoria()
-    chave_similar = encontrar_pergunta_semelhante(pergunta, mem)
-
-    if chave_similar:
-        mem[chave_similar]["vezes"] += 1
-        if resposta not in mem[chave_similar]["resposta"]:
-            # Mantém a última resposta como referência
-            mem[chave_similar]["resposta"] = resposta
-        if pergunta not in mem[chave_similar]["perguntas"]:
-            mem[chave_similar]["perguntas"].append(pergunta)
-    else:
-        mem[pergunta] = {
-            "perguntas": [pergunta],
-            "resposta": resposta,
-            "vezes": 1
-        }
+    def decidir():
+        # Corre sob o lock do diário, já com as linhas dos outros processos aplicadas
+        chave = _indice.procurar(pergunta) or pergunta
+        return {"chave": chave, "pergunta": pergunta, "resposta": resposta}
 
-    guardar_memoria(mem)
+    with _lock:
+        diario.transacao(decidir)
+        diario.talvez_compactar(lambda: _memoria)
 
 def procurar_resposta_memorizada(pergunta):
     """
     Procura se a pergunta tem resposta memorizada.
     Retorna a resposta correspondente se existir.
     """
-    mem = carregar_memoria()
-    chave = encontrar_pergunta_semelhante(pergunta, mem)
-    if chave:
-        return mem[chave]["resposta"]
+    with _lock:
+        mem = _memoria_carregada()
+        chave = _indice.procurar(pergunta)
+        if chave:
+            return mem[chave]["resposta"]
     return None
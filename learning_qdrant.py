@@ -2,87 +2,253 @@
 import json
 import random
 import numpy as np
-from sentence_transformers import SentenceTransformer, util
-from qdrant_client import QdrantClient, models
-import zipfile, tarfile, shutil
+from qdrant_client import models
+import zipfile, tarfile
+
+from arranque import Arranque
+from cache_embeddings import CacheEmbeddings
+from cache_resultados import CacheResultados, quantizar
+from colecoes import garantir_colecao, parametros_pesquisa, recriar_colecao
+from confirmacoes import RegistoConfirmacoes
+from escrita_assincrona import EscritorAssincrono
+from identificadores import id_mensagem
+from indice_memoria import IndiceMemoria
+from intencoes import INTENCOES_BASE, carregar_intencoes, contexto_da_intencao
+import metricas
+from metricas import medir
+from motor_intencoes import carregar_ou_construir
+from normalizacao import normalizar
+from recursos import obter_cliente, obter_modelo
 
 # =====================================================
 # ⚙️ CONFIGURAÇÃO GERAL
 # =====================================================
 QDRANT_PATH = "qdrant_data"
-COLLECTION_NAME = "chatbot_passagem_ano"
+QDRANT_URL = os.environ.get("QDRANT_URL")  # servidor partilhado (opcional)
+COLLECTION_NAME = "chatbot_passagem_ano"  # alias lido pela app (ver colecoes.py / migrar_colecao.py)
+MODEL_NAME = os.environ.get("CHATBOT_MODELO", "intfloat/multilingual-e5-base")
+VECTOR_SIZE = int(os.environ.get("CHATBOT_DIM", 768))
+PARAMETROS_PESQUISA = parametros_pesquisa()  # perfil em CHATBOT_PERFIL (ver colecoes.py)
+# Até este número de pontos a pesquisa semântica é feita em memória (0 desliga)
+LIMITE_INDICE_MEMORIA = int(os.environ.get("CHATBOT_LIMITE_MEMORIA", 20_000))
+# Resultados da pesquisa semântica guardados pelo embedding quantizado (0 desliga)
+CACHE_RESULTADOS_CAPACIDADE = int(os.environ.get("CHATBOT_CACHE_RESULTADOS", 2048))
+CACHE_RESULTADOS_TTL_S = float(os.environ.get("CHATBOT_CACHE_RESULTADOS_TTL_S", 300))
+
+# Modelo, base e intenções carregam em segundo plano (ver 🚀 ARRANQUE no fim)
+arranque = Arranque()
+
+def _modelo():
+    return arranque.obter("modelo")
+
+def _cliente():
+    return arranque.obter("qdrant")
 
 # --- Auto-extração da base Qdrant no arranque ---
-if not os.path.exists(QDRANT_PATH):
-    if os.path.exists("qdrant_data.zip"):
-        print("📦 A extrair base Qdrant (zip)...")
-        with zipfile.ZipFile("qdrant_data.zip", "r") as zip_ref:
-            zip_ref.extractall()
-    elif os.path.exists("qdrant_data.tar.gz"):
-        print("📦 A extrair base Qdrant (tar.gz)...")
-        with tarfile.open("qdrant_data.tar.gz", "r:gz") as tar:
-            tar.extractall()
+def extrair_base():
+    if not os.path.exists(QDRANT_PATH):
+        if os.path.exists("qdrant_data.zip"):
+            print("📦 A extrair base Qdrant (zip)...")
+            with zipfile.ZipFile("qdrant_data.zip", "r") as zip_ref:
+                zip_ref.extractall()
+        elif os.path.exists("qdrant_data.tar.gz"):
+            print("📦 A extrair base Qdrant (tar.gz)...")
+            with tarfile.open("qdrant_data.tar.gz", "r:gz") as tar:
+                tar.extractall()
 
 # =====================================================
 # 🧠 MODELO DE EMBEDDINGS
 # =====================================================
-print("🔧 A inicializar modelo de embeddings multilíngue...")
-model = SentenceTransformer("intfloat/multilingual-e5-base")
+cache_embeddings = CacheEmbeddings()
+
+# Contador de chamadas ao transformer (no máximo 1 por mensagem; 0 se vier da cache)
+ESTATISTICAS_ENCODE = {"chamadas": 0, "textos": 0}
+
+def _encode_modelo(textos, **kwargs):
+    """Única porta de entrada para o transformer — regista cada chamada."""
+    ESTATISTICAS_ENCODE["chamadas"] += 1
+    ESTATISTICAS_ENCODE["textos"] += len(textos)
+    with medir("encode"):
+        return _modelo().encode(textos, **kwargs)
+
+def codificar(texto):
+    """Codifica uma mensagem (ou lista), passando primeiro pela cache persistente."""
+    if isinstance(texto, str):
+        return cache_embeddings.codificar(MODEL_NAME, [texto], _encode_modelo)[0]
+    return cache_embeddings.codificar(MODEL_NAME, list(texto), _encode_modelo)
+
+def obter_estatisticas_encode():
+    """Devolve os contadores de codificação e da cache de embeddings."""
+    return {**ESTATISTICAS_ENCODE, "cache": cache_embeddings.estatisticas()}
 
 # =====================================================
 # 💾 INICIALIZAÇÃO QDRANT
 # =====================================================
 def inicializar_qdrant():
-    try:
-        client = QdrantClient(path=QDRANT_PATH)
-    except RuntimeError:
-        print("⚠️ Base corrompida — recriando diretório...")
-        shutil.rmtree(QDRANT_PATH, ignore_errors=True)
-        os.makedirs(QDRANT_PATH, exist_ok=True)
-        client = QdrantClient(path=QDRANT_PATH)
-
-    collections = [c.name for c in client.get_collections().collections]
-    if COLLECTION_NAME not in collections:
-        client.create_collection(
-            collection_name=COLLECTION_NAME,
-            vectors_config=models.VectorParams(size=768, distance=models.Distance.COSINE)
-        )
-        print("✨ Nova coleção criada!")
+    client = obter_cliente(QDRANT_PATH, url=QDRANT_URL)
+    garantir_colecao(client, COLLECTION_NAME, VECTOR_SIZE)
     return client
 
-client = inicializar_qdrant()
-
 # =====================================================
 # 🧭 DETEÇÃO DE INTENÇÃO SEMÂNTICA
 # =====================================================
-INTENCOES_BASE = {
-    "saudacao": ["olá", "bom dia", "boa tarde", "boa noite", "como estás"],
-    "festa": ["onde é a festa", "hora da festa", "quem vai", "vai haver música", "DJ", "vai ser no porto"],
-    "comida": ["vai haver jantar", "o que vai haver para comer", "há sobremesas", "menu"],
-    "bebida": ["vai haver cerveja", "há vinho", "cocktails", "shots", "champanhe"],
-    "roupa": ["dress code", "o que vestir", "cor do ano", "amarelo"],
-    "futebol": ["benfica", "porto", "sporting", "futebol", "jogo", "ganhar"],
-    "piadas": ["conta uma piada", "faz-me rir", "piada", "anedota"],
-    "confirmacoes": ["quem vai", "a jojo vai", "o miguel confirmou", "quantas pessoas vão"],
-    "logistica": ["há estacionamento", "transporte", "como chegar", "longe", "uber"]
-}
-intencoes_embeds = {k: model.encode(v, convert_to_tensor=True) for k, v in INTENCOES_BASE.items()}
-
-def identificar_intencao(pergunta):
-    """Deteta a intenção mais próxima com embeddings"""
-    pergunta_vec = model.encode(pergunta, convert_to_tensor=True)
-    melhor_intencao, melhor_score = "geral", 0.4
-    for k, embeds in intencoes_embeds.items():
-        sim = util.cos_sim(pergunta_vec, embeds).mean().item()
-        if sim > melhor_score:
-            melhor_intencao, melhor_score = k, sim
-    return melhor_intencao
+# Matriz de centróides lida do artefacto pré-calculado (ou recalculada se as frases mudarem)
+def _motor_intencoes():
+    return arranque.obter("intencoes")
+
+def identificar_intencao(pergunta, vetor=None):
+    """
+    Deteta a intenção mais próxima com embeddings (reutiliza o vetor do turno se existir),
+    já traduzida para o contexto da coleção (ver intencoes.CONTEXTO_DA_INTENCAO)
+    """
+    pergunta_vec = vetor if vetor is not None else codificar(pergunta)
+    motor = _motor_intencoes()
+    with medir("intencao"):
+        return contexto_da_intencao(motor.identificar(pergunta_vec))
+
+def identificar_intencoes_lote(vetores):
+    """Uma intenção por vetor, numa só multiplicação pelos centróides."""
+    motor = _motor_intencoes()
+    with medir("intencao_lote"):
+        return [contexto_da_intencao(i) for i in motor.identificar_lote(vetores)]
+
+def classificar_intencoes(pergunta, top_k=3, vetor=None):
+    """Devolve as top-k intenções com os respetivos scores."""
+    pergunta_vec = vetor if vetor is not None else codificar(pergunta)
+    return _motor_intencoes().top_k(pergunta_vec, k=top_k)
+
+# =====================================================
+# ⚡ ÍNDICE EXATO (pergunta normalizada → resposta)
+# =====================================================
+# Só entram pontos semeados: o registo de conversa guarda também fallbacks ao
+# acaso, saudações com o nome de outro convidado e listas de confirmados
+# antigas, que passariam à frente das regras. Nem as respostas que dependem do
+# evento ou do estado atual (senha do Wi-Fi, lista de confirmados).
+CONTEXTOS_DINAMICOS = {"confirmacoes", "wifi"}
+
+indice_exato = {}  # pergunta normalizada → {contexto: (id do ponto, respostas semeadas)}
+ESTATISTICAS_INDICE_EXATO = {"hits": 0, "misses": 0}
+
+def respostas_do_payload(payload):
+    """Pontos semeados guardam a lista "respostas"; o registo de conversa só "resposta"."""
+    respostas = payload.get("respostas")
+    if respostas:
+        return list(respostas)
+    return [payload["resposta"]] if payload.get("resposta") else []
+
+def _registar_no_indice(ponto_id, payload):
+    pergunta = payload.get("pergunta")
+    # Pontos semeados (ingestao.py) têm a lista "respostas"; o registo de conversa não
+    respostas = payload.get("respostas")
+    contexto = payload.get("contexto", "geral")
+    if not pergunta or not respostas or "user" in payload or contexto in CONTEXTOS_DINAMICOS:
+        return
+    indice_exato.setdefault(normalizar(pergunta), {})[contexto] = (ponto_id, list(respostas))
+
+def construir_indice_exato():
+    """Percorre todos os payloads da coleção (paginado) e preenche o índice."""
+    client = _cliente()
+    offset = None
+    try:
+        while True:
+            with medir("scroll"):
+                pontos, offset = client.scroll(
+                    collection_name=COLLECTION_NAME,
+                    limit=1000,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=False,
+                )
+            for ponto in pontos:
+                _registar_no_indice(ponto.id, ponto.payload or {})
+            if offset is None:
+                break
+        print(f"⚡ Índice exato com {len(indice_exato)} perguntas.")
+    except Exception as e:
+        print(f"⚠️ Erro ao construir índice exato: {e}")
+
+def procurar_resposta_exata(pergunta_l):
+    """
+    Devolve (resposta, contexto, vetor) se a pergunta normalizada já existir
+    na coleção, sem tocar no modelo; caso contrário (None, None, None).
+    """
+    arranque.obter("indice_exato")
+    with medir("exata"):
+        entradas = indice_exato.get(pergunta_l)
+    if not entradas:
+        ESTATISTICAS_INDICE_EXATO["misses"] += 1
+        return None, None, None
+    ESTATISTICAS_INDICE_EXATO["hits"] += 1
+    # A mesma pergunta semeada em vários contextos: fica sempre o primeiro ponto
+    # (ordem do scroll, por id); a resposta é uma das dele, como na via semântica
+    contexto, (ponto_id, respostas) = next(iter(entradas.items()))
+    resposta = random.choice(respostas)
+
+    # Reaproveita o vetor já guardado para o registo da interação
+    indice = _indice_memoria()
+    vetor = indice.obter_vetor(ponto_id) if indice is not None else None
+    if vetor is not None:
+        return resposta, contexto, vetor
+    try:
+        with medir("retrieve"):
+            pontos = _cliente().retrieve(COLLECTION_NAME, ids=[ponto_id], with_vectors=True)
+        if pontos:
+            vetor = pontos[0].vector
+    except Exception as e:
+        print(f"⚠️ Erro ao obter vetor do índice exato: {e}")
+    return resposta, contexto, vetor
+
+def obter_estatisticas_indice_exato():
+    total = ESTATISTICAS_INDICE_EXATO["hits"] + ESTATISTICAS_INDICE_EXATO["misses"]
+    return {
+        **ESTATISTICAS_INDICE_EXATO,
+        "taxa_hits": ESTATISTICAS_INDICE_EXATO["hits"] / total if total else 0.0,
+        "perguntas": len(indice_exato),
+    }
 
 # =====================================================
 # 💾 GUARDAR MENSAGEM
 # =====================================================
-def guardar_mensagem(nome, pergunta, resposta, perfil, contexto="geral"):
-    """Guarda a interação no Qdrant com identificação completa do utilizador."""
+def _escrever_lote(registos):
+    """Codifica numa só chamada os registos sem vetor e faz um único upsert."""
+    sem_vetor = [r for r in registos if r["vetor"] is None]
+    if sem_vetor:
+        for r, v in zip(sem_vetor, codificar([r["payload"]["pergunta"] for r in sem_vetor])):
+            r["vetor"] = v
+
+    with medir("upsert"):
+        _cliente().upsert(
+            collection_name=COLLECTION_NAME,
+            points=[
+                models.PointStruct(
+                    id=r["id"],
+                    vector=np.asarray(r["vetor"], dtype=np.float32).tolist(),
+                    payload=r["payload"],
+                )
+                for r in registos
+            ],
+        )
+    # O escritor corre em segundo plano: pode esperar pelo índice, e assim
+    # nenhuma escrita feita durante a sincronização inicial se perde
+    indice = arranque.obter("indice_memoria")
+    if indice is not None:
+        indice.adicionar([r["id"] for r in registos], [r["vetor"] for r in registos], [r["payload"] for r in registos])
+    # Só depois de a escrita estar visível, para nenhuma pesquisa antiga ficar em cache;
+    # só saem as entradas cujo melhor resultado estes pontos ultrapassam com outra resposta
+    por_contexto = {}
+    for r in registos:
+        vetores, respostas = por_contexto.setdefault(r["payload"].get("contexto", "geral"), ([], []))
+        vetores.append(r["vetor"])
+        respostas.append(r["payload"].get("resposta"))
+    for contexto, (vetores, respostas) in por_contexto.items():
+        cache_resultados.invalidar(contexto, vetores=vetores, respostas=respostas)
+    print(f"💾 {len(registos)} mensagens guardadas em lote")
+
+# Registo fora do caminho crítico: lotes de 32 mensagens ou a cada 200 ms
+escritor = EscritorAssincrono(_escrever_lote, max_lote=32, intervalo_ms=200, max_fila=1000)
+
+def guardar_mensagem(nome, pergunta, resposta, perfil, contexto="geral", vetor=None):
+    """Coloca a interação na fila de escrita do Qdrant com identificação completa do utilizador."""
     try:
         # Nome do utilizador: prioridade ao nome explícito, depois ao perfil
         user_name = (
@@ -91,9 +257,6 @@ def guardar_mensagem(nome, pergunta, resposta, perfil, contexto="geral"):
             else perfil.get("nome", "Desconhecido")
         )
 
-        # Criação do vetor da pergunta
-        vector = model.encode(pergunta).tolist()
-
         # Payload completo (usar 'personalidade' em vez de 'tipo')
         payload = {
             "user": user_name,
@@ -103,74 +266,266 @@ def guardar_mensagem(nome, pergunta, resposta, perfil, contexto="geral"):
             "personalidade": perfil.get("personalidade", "desconhecida"),
         }
 
-        # Inserção no Qdrant
-        client.upsert(
-            collection_name=COLLECTION_NAME,
-            points=[
-                models.PointStruct(
-                    id=random.randint(0, 1_000_000_000),
-                    vector=vector,
-                    payload=payload,
-                )
-            ],
-        )
+        # Id derivado do conteúdo: repetir a pergunta não cria pontos novos
+        ponto_id = id_mensagem(user_name, contexto, pergunta)
 
-        print(f"💾 Mensagem guardada para {user_name} ({contexto})")
+        # Sem vetor do turno, o escritor codifica em lote em segundo plano
+        escritor.enviar({"id": ponto_id, "vetor": vetor, "payload": payload})
 
     except Exception as e:
         print(f"❌ Erro ao guardar mensagem no Qdrant: {e}")
 
 
-
 # =====================================================
-# 🔍 PROCURA SEMÂNTICA COM CONTEXTO
+# 🧮 ÍNDICE EM MEMÓRIA (coleções pequenas)
 # =====================================================
-def procurar_resposta_semelhante(pergunta, intencao=None, limite_conf=0.6, top_k=3):
-    """Procura a resposta mais relevante filtrada pela intenção (corrigido e mais permissivo)"""
+def construir_indice_memoria(client):
+    """Cópia em memória da coleção se tiver até LIMITE_INDICE_MEMORIA pontos; senão None."""
     try:
-        vector = model.encode(pergunta).tolist()
-        filtro = None
+        total = client.count(COLLECTION_NAME, exact=True).count
+        if total > LIMITE_INDICE_MEMORIA:
+            print(f"🔍 {total} pontos: pesquisa semântica fica no Qdrant.")
+            return None
+        indice = IndiceMemoria(VECTOR_SIZE)
+        indice.sincronizar(client, COLLECTION_NAME)
+        print(f"🧮 Índice em memória com {len(indice)} pontos.")
+        return indice
+    except Exception as e:
+        print(f"⚠️ Erro ao construir índice em memória: {e}")
+        return None
 
-        # 🔤 Normalizar a intenção (remover acentos e minúsculas)
-        if intencao:
-            intencao = intencao.lower().replace("ç", "c").replace("ã", "a").replace("á", "a").replace("é", "e")
+def _indice_memoria():
+    """Índice em memória se já estiver pronto e dentro do limite; senão None (usa o Qdrant)."""
+    if not arranque.pronto("indice_memoria"):
+        return None
+    indice = arranque.obter("indice_memoria")
+    if indice is None or len(indice) > LIMITE_INDICE_MEMORIA:
+        return None
+    return indice
 
-        # Aplicar filtro de contexto apenas se existir intenção válida
-        if intencao and intencao != "geral":
-            filtro = models.Filter(
-                must=[models.FieldCondition(key="contexto", match=models.MatchValue(value=intencao))]
-            )
+def _filtro_contexto(contexto):
+    if not contexto:
+        return None
+    return models.Filter(
+        must=[models.FieldCondition(key="contexto", match=models.MatchValue(value=contexto))]
+    )
 
-        resultado = client.search(
+def _procurar(vetor, contexto, top_k):
+    """[(score, payload)] pelo índice em memória ou pelo Qdrant, com a mesma semântica."""
+    indice = _indice_memoria()
+    if indice is not None:
+        with medir("pesquisa_memoria"):
+            return [(score, payload) for score, payload, _ in indice.procurar(vetor, contexto, top_k)]
+    with medir("pesquisa_qdrant"):
+        resultado = _cliente().search(
             collection_name=COLLECTION_NAME,
-            query_vector=vector,
-            query_filter=filtro,
-            limit=top_k
+            query_vector=np.asarray(vetor, dtype=np.float32).tolist(),
+            query_filter=_filtro_contexto(contexto),
+            limit=top_k,
+            search_params=PARAMETROS_PESQUISA,
         )
+    return [(p.score, p.payload or {}) for p in resultado]
+
+def _procurar_lote(vetores, contextos, top_k):
+    """Uma lista [(score, payload)] por vetor; no Qdrant é um único pedido `search_batch`."""
+    if not len(contextos):
+        return []
+    indice = _indice_memoria()
+    if indice is not None:
+        with medir("pesquisa_memoria_lote"):
+            return [
+                [(score, payload) for score, payload, _ in indice.procurar(vetor, contexto, top_k)]
+                for vetor, contexto in zip(vetores, contextos)
+            ]
+    pedidos = [
+        models.SearchRequest(
+            vector=np.asarray(vetor, dtype=np.float32).tolist(),
+            filter=_filtro_contexto(contexto),
+            limit=top_k,
+            params=PARAMETROS_PESQUISA,
+            with_payload=True,
+        )
+        for vetor, contexto in zip(vetores, contextos)
+    ]
+    with medir("pesquisa_qdrant_lote"):
+        resultados = _cliente().search_batch(collection_name=COLLECTION_NAME, requests=pedidos)
+    return [[(p.score, p.payload or {}) for p in resultado] for resultado in resultados]
 
-        if not resultado:
-            return None
 
-        melhor = resultado[0]
-        if melhor.score >= limite_conf:
-            return melhor.payload.get("resposta")
+# =====================================================
+# 🔍 PROCURA SEMÂNTICA COM CONTEXTO
+# =====================================================
+# Perguntas repetidas (de convidados diferentes) não voltam a pesquisar
+# enquanto nenhuma escrita mudar o melhor resultado; ver cache_resultados.py
+cache_resultados = CacheResultados(
+    capacidade=CACHE_RESULTADOS_CAPACIDADE,
+    ttl_s=CACHE_RESULTADOS_TTL_S,
+    respostas_de=respostas_do_payload,
+)
+
+def _contexto_da_intencao(intencao):
+    # 🔤 Normalizar a intenção (remover acentos e minúsculas)
+    if intencao:
+        intencao = intencao.lower().replace("ç", "c").replace("ã", "a").replace("á", "a").replace("é", "e")
+
+    # Aplicar filtro de contexto apenas se existir intenção válida
+    return intencao if intencao and intencao != "geral" else None
+
+def procurar_semelhantes(pergunta, intencao=None, top_k=3, vetor=None):
+    """Top-k [(score, payload)] filtrado pela intenção, sem limiar (útil para avaliação)."""
+    contexto = _contexto_da_intencao(intencao)
+    if vetor is None:
+        vetor = codificar(pergunta)
+    # O limiar só se aplica depois, por isso não faz parte da chave
+    resultado = cache_resultados.obter(vetor, contexto, top_k)
+    if resultado is not None:
+        return resultado
+    geracao = cache_resultados.geracao(contexto)
+    resultado = _procurar(vetor, contexto, top_k)
+    cache_resultados.guardar(vetor, contexto, top_k, resultado, geracao)
+    return resultado
 
+def procurar_semelhantes_lote(vetores, intencoes, top_k=3):
+    """
+    `procurar_semelhantes` para um lote de vetores já codificados, num só
+    pedido; os que estão na cache ficam fora do pedido.
+    """
+    contextos = [_contexto_da_intencao(i) for i in intencoes]
+    resultados = [cache_resultados.obter(v, c, top_k) for v, c in zip(vetores, contextos)]
+    # Embeddings repetidos dentro do lote também só são pesquisados uma vez
+    chaves = [(quantizar(v).tobytes(), c) for v, c in zip(vetores, contextos)]
+    em_falta = {}
+    for i, r in enumerate(resultados):
+        if r is None:
+            em_falta.setdefault(chaves[i], i)
+    if em_falta:
+        unicos = list(em_falta.values())
+        geracoes = [cache_resultados.geracao(contextos[i]) for i in unicos]
+        novos = _procurar_lote([vetores[i] for i in unicos], [contextos[i] for i in unicos], top_k)
+        for i, geracao, resultado in zip(unicos, geracoes, novos):
+            cache_resultados.guardar(vetores[i], contextos[i], top_k, resultado, geracao)
+        por_chave = {chaves[i]: resultado for i, resultado in zip(unicos, novos)}
+        resultados = [por_chave[chave] if r is None else r for chave, r in zip(chaves, resultados)]
+    return resultados
+
+def escolher_resposta(resultado, limite_conf):
+    """Uma das respostas do melhor resultado, se o score passar o limiar; senão None."""
+    if not resultado:
+        return None
+    score, payload = resultado[0]
+    if score >= limite_conf:
+        respostas = respostas_do_payload(payload)
+        return random.choice(respostas) if respostas else None
+    return None
+
+def procurar_resposta_semelhante(pergunta, intencao=None, limite_conf=0.6, top_k=3, vetor=None):
+    """Procura a resposta mais relevante filtrada pela intenção (corrigido e mais permissivo)"""
+    try:
+        resultado = procurar_semelhantes(pergunta, intencao=intencao, top_k=top_k, vetor=vetor)
+        return escolher_resposta(resultado, limite_conf)
     except Exception as e:
         print(f"❌ Erro ao procurar resposta: {e}")
     return None
 
 
+# =====================================================
+# ✅ CONFIRMAÇÕES DE PRESENÇA
+# =====================================================
+def _registo_confirmacoes():
+    return arranque.obter("confirmacoes")
+
+def confirmar_presenca(nome):
+    """Regista a confirmação (idempotente). Devolve True se for nova."""
+    try:
+        registo = _registo_confirmacoes()
+        with medir("confirmar"):
+            nova = registo.confirmar(nome)
+        if nova:
+            # Respostas guardadas sobre confirmações podem ter deixado de estar certas
+            cache_resultados.invalidar("confirmacoes")
+        return nova
+    except Exception as e:
+        print(f"⚠️ Erro ao gravar confirmação: {e}")
+        return False
+
+def listar_confirmados():
+    """Nomes confirmados, já ordenados."""
+    registo = _registo_confirmacoes()
+    with medir("confirmados"):
+        return list(registo.confirmados())
+
+
 # =====================================================
 # 🧹 LIMPAR COLEÇÃO
 # =====================================================
 def limpar_qdrant():
     try:
-        client.delete_collection(COLLECTION_NAME)
+        escritor.esvaziar()  # o que estava na fila pertence à coleção antiga
+        client = _cliente()
+        recriar_colecao(client, COLLECTION_NAME, VECTOR_SIZE)
         print("🧹 Coleção Qdrant apagada.")
-        client.create_collection(
-            collection_name=COLLECTION_NAME,
-            vectors_config=models.VectorParams(size=768, distance=models.Distance.COSINE)
-        )
+        indice_exato.clear()
+        cache_resultados.limpar()
+        indice = arranque.obter("indice_memoria")
+        if indice is not None:
+            indice.limpar()
         print("✨ Nova coleção criada.")
     except Exception as e:
         print(f"Erro ao limpar Qdrant: {e}")
+
+
+# =====================================================
+# 🚀 ARRANQUE
+# =====================================================
+# Extração, modelo e intenções correm em paralelo; cada função acima só
+# bloqueia na etapa de que precisa. As regras fixas da app não dependem
+# de nenhuma delas e respondem logo.
+def iniciar_arranque():
+    arranque.iniciar("extracao", extrair_base)
+    arranque.iniciar("modelo", lambda: obter_modelo(MODEL_NAME))
+    arranque.iniciar("qdrant", lambda _: inicializar_qdrant(), depende=["extracao"])
+    # Com o artefacto em dia não espera pelo modelo; só o pede se tiver de recalcular
+    arranque.iniciar("intencoes", lambda: carregar_ou_construir(_modelo, carregar_intencoes(), MODEL_NAME))
+    arranque.iniciar("indice_exato", lambda _: construir_indice_exato(), depende=["qdrant"])
+    arranque.iniciar("indice_memoria", construir_indice_memoria, depende=["qdrant"])
+    arranque.iniciar(
+        "confirmacoes", lambda c: RegistoConfirmacoes(
+            c, colecao_legado=COLLECTION_NAME,
+            # Confirmações de outro processo: as respostas guardadas sobre elas ficaram para trás
+            ao_mudar=lambda: cache_resultados.invalidar("confirmacoes"),
+        ), depende=["qdrant"]
+    )
+
+# Sem estas a cadeia completa não responde (o índice em memória é opcional)
+ETAPAS_ESSENCIAIS = ("modelo", "qdrant", "intencoes", "indice_exato", "confirmacoes")
+
+def arranque_concluido():
+    """True quando o modelo, a base e as intenções já estão prontos."""
+    return arranque.pronto(*ETAPAS_ESSENCIAIS)
+
+def esperar_arranque():
+    """Bloqueia até todas as etapas, incluindo o índice em memória, estarem prontas (scripts)."""
+    for etapa in ETAPAS_ESSENCIAIS + ("indice_memoria",):
+        arranque.obter(etapa)
+
+def __getattr__(nome):
+    # Compatibilidade: `learning_qdrant.model` / `.client` bloqueiam até estarem prontos
+    etapas = {"model": "modelo", "client": "qdrant", "motor_intencoes": "intencoes",
+              "registo_confirmacoes": "confirmacoes"}
+    if nome in etapas:
+        return arranque.obter(etapas[nome])
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+# Contadores já existentes entram na mesma exportação que os histogramas
+metricas.registar_coletor("encode", lambda: ESTATISTICAS_ENCODE)
+metricas.registar_coletor("cache_resultados", cache_resultados.estatisticas)
+metricas.registar_coletor("cache_embeddings", cache_embeddings.estatisticas)
+metricas.registar_coletor("indice_exato", obter_estatisticas_indice_exato)
+metricas.registar_coletor("escrita", lambda: {"pendentes": escritor.pendentes()})
+if metricas.ATIVO and os.environ.get("CHATBOT_METRICAS_PORTA"):
+    try:
+        metricas.servir()
+    except OSError as e:
+        print(f"⚠️ Servidor de métricas não arrancou: {e}")
+
+iniciar_arranque()
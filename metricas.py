@@ -0,0 +1,199 @@
+# metricas.py
+import os
+import json
+import time
+import bisect
+import threading
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# Desligado por omissão: `medir` devolve um contexto vazio partilhado e não mede nada
+ATIVO = os.environ.get("CHATBOT_METRICAS", "0") == "1"
+
+# Limites dos buckets em milissegundos (estilo Prometheus, +Inf implícito)
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+JANELA = 1024  # amostras recentes guardadas por série para os percentis
+
+_NULO = nullcontext()
+_local = threading.local()
+_lock = threading.Lock()
+_series = {}    # (etapa, ramo) → Histograma
+_coletores = {}  # nome → função que devolve um dict de números
+
+
+# =====================================================
+# 📈 HISTOGRAMA COM JANELA DESLIZANTE
+# =====================================================
+class Histograma:
+    """Buckets cumulativos (para o Prometheus) e as últimas JANELA amostras (para percentis)."""
+
+    def __init__(self):
+        self.contagens = [0] * (len(BUCKETS_MS) + 1)
+        self.soma = 0.0
+        self.total = 0
+        self.recentes = deque(maxlen=JANELA)
+
+    def observar(self, ms):
+        self.contagens[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.soma += ms
+        self.total += 1
+        self.recentes.append(ms)
+
+    def percentis(self):
+        if not self.recentes:
+            return {}
+        p50, p95, p99 = np.percentile(np.fromiter(self.recentes, dtype=np.float64), [50, 95, 99])
+        return {"p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99)}
+
+
+def ativar(ativo=True):
+    global ATIVO
+    ATIVO = ativo
+
+
+def observar(etapa, ms, ramo=""):
+    with _lock:
+        serie = _series.get((etapa, ramo))
+        if serie is None:
+            serie = _series[(etapa, ramo)] = Histograma()
+        serie.observar(ms)
+
+
+# =====================================================
+# ⏱️ MEDIÇÃO
+# =====================================================
+@contextmanager
+def _medir(etapa):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - t0) * 1000
+        pendentes = getattr(_local, "turno", None)
+        if pendentes is not None:
+            # Dentro de um turno: só se regista no fim, já com o ramo que respondeu
+            pendentes.append((etapa, ms))
+        else:
+            observar(etapa, ms)
+
+
+def medir(etapa):
+    """`with medir("encode"): ...` — custo de um atributo global quando desligado."""
+    return _medir(etapa) if ATIVO else _NULO
+
+
+class Turno:
+    ramo = ""
+
+
+@contextmanager
+def _turno():
+    _local.turno = pendentes = []
+    turno = Turno()
+    t0 = time.perf_counter()
+    try:
+        yield turno
+    finally:
+        total = (time.perf_counter() - t0) * 1000
+        _local.turno = None
+        for etapa, ms in pendentes:
+            observar(etapa, ms, turno.ramo)
+        observar("total", total, turno.ramo)
+
+
+def turno():
+    """
+    Agrupa as medições de uma resposta: quem o usa define `t.ramo` antes de
+    sair e todas as etapas do turno ficam etiquetadas com esse ramo.
+    """
+    return _turno() if ATIVO else nullcontext(Turno())
+
+
+# =====================================================
+# 📤 EXPORTAÇÃO (Prometheus / JSON)
+# =====================================================
+def registar_coletor(nome, fn):
+    """Junta à exportação os números de `fn()` (dicts aninhados são achatados)."""
+    _coletores[nome] = fn
+
+
+def _achatar(prefixo, valores):
+    for chave, valor in valores.items():
+        nome = f"{prefixo}_{chave}"
+        if isinstance(valor, dict):
+            yield from _achatar(nome, valor)
+        elif isinstance(valor, (int, float)) and not isinstance(valor, bool):
+            yield nome, valor
+
+
+def _valores_coletores():
+    valores = {}
+    for nome, fn in list(_coletores.items()):
+        try:
+            valores.update(_achatar(nome, fn()))
+        except Exception as e:
+            print(f"⚠️ Coletor de métricas '{nome}' falhou: {e}")
+    return valores
+
+
+def exportar_json():
+    with _lock:
+        etapas = {
+            f"{etapa}|{ramo}" if ramo else etapa: {
+                "etapa": etapa, "ramo": ramo, "n": h.total, "soma_ms": h.soma, **h.percentis()
+            }
+            for (etapa, ramo), h in sorted(_series.items())
+        }
+    return {"ativo": ATIVO, "etapas": etapas, "contadores": _valores_coletores()}
+
+
+def exportar_prometheus():
+    linhas = [
+        "# HELP chatbot_etapa_ms Duração de cada etapa da resposta (ms).",
+        "# TYPE chatbot_etapa_ms histogram",
+    ]
+    with _lock:
+        for (etapa, ramo), h in sorted(_series.items()):
+            etiquetas = f'etapa="{etapa}",ramo="{ramo}"'
+            acumulado = 0
+            for limite, n in zip(BUCKETS_MS + ("+Inf",), h.contagens):
+                acumulado += n
+                linhas.append(f'chatbot_etapa_ms_bucket{{{etiquetas},le="{limite}"}} {acumulado}')
+            linhas.append(f"chatbot_etapa_ms_sum{{{etiquetas}}} {h.soma}")
+            linhas.append(f"chatbot_etapa_ms_count{{{etiquetas}}} {h.total}")
+    for nome, valor in sorted(_valores_coletores().items()):
+        linhas.append(f"# TYPE chatbot_{nome} gauge")
+        linhas.append(f"chatbot_{nome} {valor}")
+    return "\n".join(linhas) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/metrics"):
+            corpo, tipo = exportar_prometheus(), "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path.startswith("/metricas.json"):
+            corpo, tipo = json.dumps(exportar_json(), ensure_ascii=False), "application/json; charset=utf-8"
+        else:
+            self.send_error(404)
+            return
+        dados = corpo.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, *_):
+        pass
+
+
+def servir(porta=None):
+    """Servidor HTTP em segundo plano com /metrics (Prometheus) e /metricas.json."""
+    porta = int(porta or os.environ.get("CHATBOT_METRICAS_PORTA", 9108))
+    servidor = ThreadingHTTPServer(("0.0.0.0", porta), _Handler)
+    threading.Thread(target=servidor.serve_forever, name="metricas", daemon=True).start()
+    print(f"📈 Métricas em http://localhost:{porta}/metrics e /metricas.json")
+    return servidor
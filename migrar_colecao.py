@@ -0,0 +1,228 @@
+# migrar_colecao.py
+# Troca de modelo de embeddings sem perder o histórico aprendido:
+#   python migrar_colecao.py --modelo intfloat/multilingual-e5-large
+#   python migrar_colecao.py --origem-path qdrant_db     # traz a base antiga (MiniLM, 384 dims)
+#   python migrar_colecao.py ... --apagar-antiga         # apaga a coleção de origem no fim
+#   python migrar_colecao.py --perfil grande             # mesmo modelo, outro perfil de coleção
+#
+# Lê a coleção atual página a página, volta a codificar o campo `pergunta` de
+# cada ponto com o modelo novo, escreve tudo numa coleção física nova, confirma
+# as contagens e só então muda o alias "chatbot_passagem_ano" numa operação
+# atómica. A app continua a responder pela coleção antiga até ao último passo.
+# Se for interrompida, corre-se o mesmo comando e retoma do último checkpoint
+# (também a meio da troca do alias numa base anterior aos aliases).
+# Com a app a correr ao mesmo tempo é preciso QDRANT_URL (o modo local só
+# admite um processo).
+import os
+import re
+import json
+import hashlib
+import argparse
+
+import numpy as np
+from qdrant_client import models
+
+from cache_embeddings import CacheEmbeddings
+from codificador_multiprocesso import CodificadorMultiprocesso
+from colecoes import PERFIS, apontar_alias, criar_colecao, mapa_aliases, nome_versionado, resolver_colecao
+from ingestao import percorrer_colecao
+from recursos import obter_cliente
+
+QDRANT_PATH = "qdrant_data"
+QDRANT_URL = os.environ.get("QDRANT_URL")
+COLLECTION_NAME = "chatbot_passagem_ano"
+CHECKPOINT_PATH = "migracao_checkpoint.json"
+
+
+# =====================================================
+# 💾 CHECKPOINT
+# =====================================================
+def ler_checkpoint(path=CHECKPOINT_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def gravar_checkpoint(estado, path=CHECKPOINT_PATH):
+    """Escreve o estado atomicamente (tmp + replace): nunca fica meio escrito."""
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(estado, f, ensure_ascii=False, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def etiqueta_modelo(nome_modelo):
+    return re.sub(r"[^a-z0-9]+", "-", nome_modelo.split("/")[-1].lower()).strip("-")
+
+
+# =====================================================
+# 🔁 CÓPIA COM RE-EMBEDDING
+# =====================================================
+def copiar_pagina(pontos, destino_client, destino, codificar_lote, dim):
+    """
+    Recodifica a `pergunta` dos pontos que a têm; os restantes (ex.: registos
+    antigos de confirmações) seguem com um vetor nulo da nova dimensão.
+    """
+    com_pergunta = [p for p in pontos if (p.payload or {}).get("pergunta")]
+    vetores = {}
+    if com_pergunta:
+        for p, v in zip(com_pergunta, codificar_lote([p.payload["pergunta"] for p in com_pergunta])):
+            vetores[p.id] = np.asarray(v, dtype=np.float32).tolist()
+    nulo = [0.0] * dim
+    destino_client.upsert(
+        collection_name=destino,
+        points=[models.PointStruct(id=p.id, vector=vetores.get(p.id, nulo), payload=p.payload) for p in pontos],
+    )
+    return len(pontos)
+
+
+def hash_payload(payload):
+    return hashlib.sha1(json.dumps(payload or {}, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def diferencas(origem_client, origem, destino_client, destino, tamanho_pagina):
+    """Páginas de pontos da origem que faltam no destino ou cujo payload mudou depois de copiados."""
+    for pontos, _ in percorrer_colecao(origem_client, origem, tamanho_pagina=tamanho_pagina):
+        copiados = {
+            p.id: hash_payload(p.payload)
+            for p in destino_client.retrieve(destino, ids=[p.id for p in pontos], with_payload=True)
+        }
+        diferentes = [p for p in pontos if copiados.get(p.id) != hash_payload(p.payload)]
+        if diferentes:
+            yield diferentes
+
+
+def recuperar_diferencas(origem_client, origem, destino_client, destino, codificar_lote, dim, tamanho_pagina):
+    """Segunda passagem: copia o que a app escreveu ou alterou na origem durante a cópia."""
+    copiados = 0
+    for diferentes in diferencas(origem_client, origem, destino_client, destino, tamanho_pagina):
+        copiados += copiar_pagina(diferentes, destino_client, destino, codificar_lote, dim)
+    return copiados
+
+
+def trocar_alias(client, destino, estado, apagar_legado):
+    """
+    Aponta o alias para `destino`. Numa base anterior aos aliases a coleção
+    física com o nome do alias tem de sair primeiro: o checkpoint regista a
+    fase antes de a apagar, e correr o comando outra vez conclui a troca.
+    """
+    if apagar_legado:
+        estado["fase"] = "alias"
+        gravar_checkpoint(estado)
+        client.delete_collection(COLLECTION_NAME)
+        print(f"🧹 Coleção antiga '{COLLECTION_NAME}' apagada para dar lugar ao alias.")
+    apontar_alias(client, COLLECTION_NAME, destino)
+    print(f"🔀 Alias '{COLLECTION_NAME}' → '{destino}'")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migra a coleção para um novo modelo de embeddings (troca de alias sem paragem).")
+    parser.add_argument("--modelo", default=os.environ.get("CHATBOT_MODELO", "intfloat/multilingual-e5-base"))
+    parser.add_argument("--origem-path", help="base Qdrant local de origem (omissão: a mesma do destino)")
+    parser.add_argument("--lote", type=int, default=256, help="pontos por página de scroll/encode/upsert")
+    parser.add_argument("--processos", type=int, default=1, help="processos de codificação (0 = todos os cores)")
+    parser.add_argument("--perfil", choices=sorted(PERFIS), help="perfil da coleção nova (omissão: CHATBOT_PERFIL)")
+    parser.add_argument("--apagar-antiga", action="store_true", help="apaga a coleção de origem depois da troca")
+    args = parser.parse_args()
+
+    os.makedirs(QDRANT_PATH, exist_ok=True)
+    client = obter_cliente(QDRANT_PATH, url=QDRANT_URL)
+
+    estado = ler_checkpoint()
+    if estado and estado.get("fase") == "alias":
+        # A coleção antiga já foi apagada depois de a cópia ter sido verificada
+        print(f"♻️ A concluir a troca do alias para '{estado['destino']}'.")
+        trocar_alias(client, estado["destino"], estado, apagar_legado=False)
+        os.remove(CHECKPOINT_PATH)
+        return
+
+    origem_client = obter_cliente(args.origem_path) if args.origem_path else client
+
+    codificador = CodificadorMultiprocesso(args.modelo, processos=args.processos or None)
+    # A cache guarda cada modelo na sua loja, com a sua dimensão: os vetores do
+    # modelo novo não tocam nos da app e ficam prontos para quando ela mudar
+    cache = CacheEmbeddings()
+    dim = int(codificador.model.get_sentence_embedding_dimension())
+
+    def codificar_lote(perguntas):
+        return cache.codificar(args.modelo, perguntas, codificador.codificar, batch_size=64)
+
+    if estado and estado.get("modelo") == args.modelo and estado.get("origem_path") == args.origem_path:
+        origem, destino = estado["origem"], estado["destino"]
+        print(f"♻️ A retomar migração '{origem}' → '{destino}' ({estado['copiados']} pontos já copiados).")
+    else:
+        origem = resolver_colecao(origem_client, COLLECTION_NAME)
+        if origem is None:
+            print(f"❌ Não existe coleção '{COLLECTION_NAME}' para migrar.")
+            return
+        destino = nome_versionado(COLLECTION_NAME, etiqueta_modelo(args.modelo))
+        estado = {
+            "origem": origem,
+            "origem_path": args.origem_path,
+            "destino": destino,
+            "modelo": args.modelo,
+            "dim": dim,
+            "offset": None,
+            "copiados": 0,
+            "concluida": False,
+        }
+        gravar_checkpoint(estado)
+        print(f"🚚 Migração '{origem}' → '{destino}' ({args.modelo}, {dim} dims)")
+
+    if destino not in [c.name for c in client.get_collections().collections]:
+        criar_colecao(client, destino, dim, perfil=args.perfil)
+
+    try:
+        if not estado["concluida"]:
+            # O offset do checkpoint é o id do primeiro ponto da página seguinte
+            for pontos, offset in percorrer_colecao(origem_client, origem, tamanho_pagina=args.lote, offset=estado["offset"]):
+                estado["copiados"] += copiar_pagina(pontos, client, destino, codificar_lote, dim)
+                estado["offset"] = offset
+                gravar_checkpoint(estado)
+                print(f"   … {estado['copiados']} pontos copiados")
+            estado["concluida"] = True
+            gravar_checkpoint(estado)
+
+        extra = recuperar_diferencas(origem_client, origem, client, destino, codificar_lote, dim, args.lote)
+        if extra:
+            print(f"➕ {extra} pontos novos ou alterados copiados na segunda passagem.")
+    finally:
+        codificador.fechar()
+        cache.gravar()
+
+    # =====================================================
+    # ✅ VERIFICAÇÃO E TROCA DO ALIAS
+    # =====================================================
+    n_origem = origem_client.count(origem, exact=True).count
+    n_destino = client.count(destino, exact=True).count
+    if n_origem != n_destino:
+        print(f"❌ Contagens diferentes: origem {n_origem}, destino {n_destino}. O alias não foi alterado; volta a correr para retomar.")
+        return
+    # Antes de qualquer troca (e de apagar a coleção antiga): o mesmo payload em todos os ids
+    pendentes = sum(len(d) for d in diferencas(origem_client, origem, client, destino, args.lote))
+    if pendentes:
+        print(f"❌ {pendentes} pontos mudaram na origem desde a cópia. O alias não foi alterado; volta a correr para retomar.")
+        return
+    print(f"✅ Cópia verificada: {n_destino} pontos com o mesmo payload.")
+
+    mesma_base = origem_client is client
+    legado = COLLECTION_NAME not in mapa_aliases(client) and resolver_colecao(client, COLLECTION_NAME) == COLLECTION_NAME
+    if legado and not (mesma_base and origem == COLLECTION_NAME):
+        print(f"❌ Já existe uma coleção '{COLLECTION_NAME}' (sem alias) no destino que não é a origem — não foi apagada.")
+        return
+    # Base anterior aos aliases: a coleção física tem o nome do alias e tem de
+    # sair antes de o alias poder existir (só acontece uma vez)
+    trocar_alias(client, destino, estado, apagar_legado=legado)
+
+    if args.apagar_antiga and (not mesma_base or origem != COLLECTION_NAME):
+        origem_client.delete_collection(origem)
+        print(f"🧹 Coleção de origem '{origem}' apagada.")
+
+    os.remove(CHECKPOINT_PATH)
+    if args.modelo != os.environ.get("CHATBOT_MODELO", "intfloat/multilingual-e5-base"):
+        print(f"ℹ️ Arranca a app com CHATBOT_MODELO={args.modelo} CHATBOT_DIM={dim}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# motor_intencoes.py
+import os
+import json
+import hashlib
+
+import numpy as np
+
+# Abaixo deste score a intenção fica "geral" (mesmo limiar do ciclo original)
+LIMIAR_GERAL = 0.4
+
+
+def normalizar_linhas(matriz):
+    """Normaliza cada linha para norma 1 (linhas a zero ficam a zero)."""
+    matriz = np.asarray(matriz, dtype=np.float32)
+    normas = np.linalg.norm(matriz, axis=-1, keepdims=True)
+    normas[normas == 0] = 1.0
+    return matriz / normas
+
+
+# =====================================================
+# 🧭 MOTOR DE INTENÇÕES VETORIZADO
+# =====================================================
+class MotorIntencoes:
+    """
+    Classificador de intenções com uma matriz de centróides pré-calculada.
+
+    Cada centróide é a média dos exemplos já normalizados, por isso o produto
+    com a pergunta normalizada é exatamente a média do cosseno que o ciclo
+    antigo calculava intenção a intenção — agora numa só multiplicação.
+    """
+
+    def __init__(self, intencoes_embeds, limiar=LIMIAR_GERAL):
+        self.nomes = list(intencoes_embeds.keys())
+        self.limiar = limiar
+        self.matriz = np.vstack(
+            [normalizar_linhas(e).mean(axis=0) for e in intencoes_embeds.values()]
+        ).astype(np.float32)
+
+    @classmethod
+    def a_partir_de_frases(cls, model, intencoes, limiar=LIMIAR_GERAL):
+        """Codifica todas as frases de exemplo numa única chamada ao modelo."""
+        frases = [f for exemplos in intencoes.values() for f in exemplos]
+        embeds = np.asarray(model.encode(frases), dtype=np.float32)
+        por_intencao, inicio = {}, 0
+        for nome, exemplos in intencoes.items():
+            por_intencao[nome] = embeds[inicio:inicio + len(exemplos)]
+            inicio += len(exemplos)
+        return cls(por_intencao, limiar=limiar)
+
+    def pontuar(self, vetores):
+        """Scores (n_perguntas x n_intenções) para um vetor ou uma matriz de vetores."""
+        return normalizar_linhas(np.atleast_2d(vetores)) @ self.matriz.T
+
+    def top_k(self, vetor, k=3):
+        """Devolve as k intenções mais próximas como [(intenção, score), ...]."""
+        scores = self.pontuar(vetor)[0]
+        ordem = np.argsort(-scores, kind="stable")[:k]
+        return [(self.nomes[i], float(scores[i])) for i in ordem]
+
+    def identificar(self, vetor):
+        """Intenção vencedora, ou "geral" se nenhuma passar o limiar."""
+        return self.identificar_lote(vetor)[0]
+
+    def identificar_lote(self, vetores):
+        """Uma intenção por linha, com uma só multiplicação para o lote inteiro."""
+        scores = self.pontuar(vetores)
+        melhores = scores.argmax(axis=1)
+        return [
+            self.nomes[i] if scores[linha, i] > self.limiar else "geral"
+            for linha, i in enumerate(melhores)
+        ]
+
+    @classmethod
+    def a_partir_de_centroides(cls, nomes, matriz, limiar=LIMIAR_GERAL):
+        """Reconstrói o motor a partir de uma matriz já calculada (sem tocar no modelo)."""
+        motor = cls.__new__(cls)
+        motor.nomes = list(nomes)
+        motor.limiar = limiar
+        motor.matriz = matriz
+        return motor
+
+
+# =====================================================
+# 📦 ARTEFACTO PRÉ-CALCULADO (.npy + metadados)
+# =====================================================
+ARTEFACTO_VERSAO = 1
+ARTEFACTO_PATH = "intencoes_centroides"
+# O artefacto deste modelo vai no repositório; os dos outros ficam ao lado,
+# com a assinatura no nome, e são ignorados pelo git
+MODELO_ARTEFACTO = "intfloat/multilingual-e5-base"
+
+
+def assinatura_intencoes(intencoes, nome_modelo):
+    """Hash das frases, do modelo e da versão do formato: muda se qualquer um mudar."""
+    conteudo = json.dumps(
+        {"versao": ARTEFACTO_VERSAO, "modelo": nome_modelo, "intencoes": intencoes},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+def path_artefacto(nome_modelo, assinatura):
+    """`intencoes_centroides` para o modelo por omissão; senão com a assinatura no nome."""
+    if nome_modelo == MODELO_ARTEFACTO:
+        return ARTEFACTO_PATH
+    return f"{ARTEFACTO_PATH}-{assinatura[:16]}"
+
+
+def guardar_artefacto(motor, assinatura, nome_modelo, path=ARTEFACTO_PATH):
+    """Grava a matriz em `<path>.npy` e os metadados em `<path>.json` (atomicamente)."""
+    np.save(path + ".tmp.npy", motor.matriz)
+    os.replace(path + ".tmp.npy", path + ".npy")
+    meta = {
+        "versao": ARTEFACTO_VERSAO,
+        "assinatura": assinatura,
+        "modelo": nome_modelo,
+        "nomes": motor.nomes,
+        "dim": int(motor.matriz.shape[1]),
+    }
+    with open(path + ".json.tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(path + ".json.tmp", path + ".json")
+
+
+def carregar_artefacto(assinatura, limiar=LIMIAR_GERAL, path=ARTEFACTO_PATH):
+    """Motor memory-mapped a partir do artefacto, ou None se faltar ou estiver desatualizado."""
+    try:
+        with open(path + ".json", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("assinatura") != assinatura:
+            return None
+        matriz = np.load(path + ".npy", mmap_mode="r")
+    except (OSError, ValueError, json.JSONDecodeError):
+        return None
+    return MotorIntencoes.a_partir_de_centroides(meta["nomes"], matriz, limiar=limiar)
+
+
+def carregar_ou_construir(obter_modelo, intencoes, nome_modelo, path=None):
+    """
+    Usa o artefacto se as frases e o modelo coincidirem; caso contrário chama
+    `obter_modelo()`, recalcula os centróides e regrava o artefacto.
+    """
+    assinatura = assinatura_intencoes(intencoes, nome_modelo)
+    path = path or path_artefacto(nome_modelo, assinatura)
+    motor = carregar_artefacto(assinatura, path=path)
+    if motor is not None:
+        print(f"📦 Intenções carregadas do artefacto '{path}.npy' ({len(motor.nomes)} intenções).")
+        return motor
+    print("🧭 Artefacto de intenções em falta ou desatualizado — a recalcular...")
+    motor = MotorIntencoes.a_partir_de_frases(obter_modelo(), intencoes)
+    try:
+        guardar_artefacto(motor, assinatura, nome_modelo, path=path)
+    except OSError as e:
+        print(f"⚠️ Não foi possível gravar o artefacto de intenções: {e}")
+    return motor
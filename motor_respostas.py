@@ -0,0 +1,316 @@
+# motor_respostas.py
+# Cadeia de decisão do assistente, sem Streamlit: recebe o estado da conversa
+# (st.session_state na app, um dict na avaliação) e o evento explicitamente.
+import random
+
+from evento import EVENTO_OMISSAO, carregar_evento, carregar_json  # noqa: F401 (reexportados)
+from learning_qdrant import (
+    arranque_concluido,
+    codificar,
+    procurar_resposta_exata,
+    confirmar_presenca,
+    listar_confirmados,
+    identificar_intencao,
+    identificar_intencoes_lote,
+    procurar_semelhantes,
+    procurar_semelhantes_lote,
+    escolher_resposta,
+    guardar_mensagem,
+    obter_estatisticas_encode,
+)
+import metricas
+from metricas import medir
+from normalizacao import normalizar
+from regras import regras_compiladas
+
+# Parâmetros da pesquisa semântica (avaliar com avaliacao_respostas.py antes de mexer)
+LIMITE_CONF = 0.55
+TOP_K = 3
+
+# =====================================================
+# 🧠 Tom adaptativo
+# =====================================================
+def ajustar_tom(texto: str, contexto: str, perfil: dict) -> str:
+    ctx_animado = {"festa", "piadas", "futebol", "social", "saudacao", "comida", "bebida"}
+    ctx_informativo = {"wifi", "hora", "roupa", "logistica", "confirmacoes"}
+
+    if contexto in ctx_informativo:
+        return texto
+
+    if contexto in ctx_animado:
+        extras = ["🎉", "😄", "😉", "🥳", "✨", "💃🕺", "🍾"]
+        if not any(e in texto for e in extras):
+            texto = f"{texto} {random.choice(extras)}"
+        return texto
+
+    return texto
+
+# =====================================================
+# 💬 Regras fixas (fallback rápido)
+# =====================================================
+# Os padrões de cada regra estão em regras.py; aqui só o texto de cada resposta
+def regras_fallback(pergunta_l: str, event: dict, correspondencias=None) -> tuple[str, str] | tuple[None, None]:
+    with medir("regras"):
+        if correspondencias is None:
+            correspondencias = regras_compiladas.avaliar(pergunta_l)
+        regra = correspondencias.grupo("fallback")
+
+    if regra == "nome_bot":
+        return ("Sou o Diácono Remédios, ao vosso serviço 🙏😄", "saudacao")
+
+    if regra == "local":
+        return (f"A festa é em **{event.get('local', 'Casa do Miguel, Porto')}**.", "festa")
+
+    if regra == "hora":
+        return (f"Começa às **{event.get('hora', '21h00')}**.", "hora")
+
+    if regra == "wifi":
+        return (f"A senha do Wi-Fi é **{event.get('wifi', 'CasaDoMiguel2025')}**.", "wifi")
+
+    if regra == "roupa":
+        dc = event.get("dress_code", "casual elegante")
+        return (f"O dress code é **{dc}** e a cor deste ano é **amarelo 💛**.", "roupa")
+
+    if regra == "levar":
+        lista = ", ".join(event.get("trazer", ["boa disposição"]))
+        return (f"Podes trazer: {lista}.", "logistica")
+
+    return (None, None)
+
+# =====================================================
+# 🗂️ Estado da conversa
+# =====================================================
+class EstadoSessao(dict):
+    """
+    Estado de uma conversa fora do Streamlit, com o mesmo contrato que a
+    cadeia usa de st.session_state (`get` e `[]`). Hoje só guarda
+    "ultimo_contexto", de que depende a deteção de confirmações.
+    """
+
+    @property
+    def ultimo_contexto(self):
+        return self.get("ultimo_contexto", "")
+
+# =====================================================
+# 🧠 Cadeia de decisão
+# =====================================================
+def responder(pergunta: str, perfil: dict, estado, event: dict,
+              limite_conf=LIMITE_CONF, top_k=TOP_K, registar=True):
+    """
+    Resposta sem ajuste de tom, como (resposta, contexto, ramo). `estado` é
+    qualquer mapping com get/[] (st.session_state ou um dict); `ramo` diz que
+    passo da cadeia respondeu. Com `registar=False` nada é escrito na base
+    (nem mensagens nem confirmações) — é o modo da avaliação.
+
+    Com métricas ativas, as etapas do turno ficam etiquetadas com o ramo.
+    """
+    resposta, contexto, ramo, _ = _responder_turno(pergunta, perfil, estado, event, limite_conf, top_k, registar)
+    return resposta, contexto, ramo
+
+# Turnos respondidos neste processo; com o contador de encodes dá os encodes por turno
+ESTATISTICAS_TURNOS = {"total": 0}
+
+def _estatisticas_turnos():
+    total = ESTATISTICAS_TURNOS["total"]
+    chamadas = obter_estatisticas_encode()["chamadas"]
+    return {"total": total, "encodes_por_turno": chamadas / total if total else 0.0}
+
+metricas.registar_coletor("turnos", _estatisticas_turnos)
+
+def _responder_turno(pergunta, perfil, estado, event, limite_conf, top_k, registar, preparado=None):
+    ESTATISTICAS_TURNOS["total"] += 1
+    with metricas.turno() as turno:
+        resultado = _responder(pergunta, perfil, estado, event, limite_conf, top_k, registar, preparado)
+        turno.ramo = resultado[2]
+    return resultado
+
+def _responder(pergunta, perfil, estado, event, limite_conf, top_k, registar, preparado=None):
+    """
+    (resposta, contexto, ramo, score), com score o melhor da pesquisa semântica
+    (None se o turno não chegou a pesquisar). `preparado` traz o que o lote já
+    calculou para esta pergunta (normalizada, regras, exata, vetor, intenção,
+    semelhantes); o que faltar é calculado aqui.
+    """
+    preparado = preparado or {}
+    guardar = guardar_mensagem if registar else (lambda *a, **k: None)
+    pergunta_l = preparado.get("pergunta_l") or normalizar(pergunta)
+    # Uma só passagem pelo texto serve todas as verificações por palavras-chave do turno
+    correspondencias = preparado.get("correspondencias")
+    if correspondencias is None:
+        with medir("regras"):
+            correspondencias = regras_compiladas.avaliar(pergunta_l)
+
+    ultima_intencao = estado.get("ultimo_contexto", "")
+    e_confirmacao = ultima_intencao == "confirmacoes" and correspondencias.tem("confirmacao")
+
+    # 🚀 Ainda a arrancar: as regras fixas respondem sem esperar pelo modelo
+    if not e_confirmacao and not arranque_concluido():
+        resposta_regra, contexto = regras_fallback(pergunta_l, event, correspondencias)
+        if resposta_regra:
+            guardar(perfil["nome"], pergunta_l, resposta_regra, perfil, contexto)
+            estado["ultimo_contexto"] = contexto
+            return resposta_regra, contexto, "regras_arranque", None
+
+    # ⚡ Pergunta já conhecida — responde sem tocar no modelo
+    if not e_confirmacao:
+        exata = preparado.get("exata") or procurar_resposta_exata(pergunta_l)
+        resposta_exata, contexto_exato, vetor_exato = exata
+        if resposta_exata:
+            guardar(perfil["nome"], pergunta_l, resposta_exata, perfil, contexto_exato, vetor=vetor_exato)
+            estado["ultimo_contexto"] = contexto_exato
+            return resposta_exata, contexto_exato, "exata", None
+
+    # Um único encode por turno, partilhado pela intenção, pesquisa e registo
+    vetor = preparado.get("vetor")
+    if vetor is None:
+        vetor = codificar(pergunta_l)
+    intencao = preparado.get("intencao") or identificar_intencao(pergunta_l, vetor=vetor)
+
+    # ✅ Confirmação direta do utilizador
+    if e_confirmacao:
+        user_name = perfil.get("nome", "Desconhecido")
+        resposta = f"Boa! 🎉 Fico feliz por saber que vais, {user_name}. Já estás na lista!"
+        guardar(user_name, pergunta_l, resposta, perfil, contexto="confirmacoes", vetor=vetor)
+
+        # Registar no conjunto de confirmados
+        if registar and confirmar_presenca(user_name):
+            print(f"✅ {user_name} registado como confirmado.")
+
+        # Atualizar lista imediatamente
+        estado["ultimo_contexto"] = "confirmacoes"
+        confirmados = listar_confirmados()
+        if confirmados:
+            resposta_extra = f"Agora a lista está assim: {', '.join(confirmados)} 🎉"
+            resposta = f"{resposta}\n\n{resposta_extra}"
+
+        return resposta, "confirmacoes", "confirmacao", None
+
+    # 1️⃣ — Procurar resposta semelhante no Qdrant
+    semelhantes = preparado.get("semelhantes")
+    if semelhantes is None:
+        try:
+            semelhantes = procurar_semelhantes(pergunta_l, intencao=intencao, top_k=top_k, vetor=vetor)
+        except Exception as e:
+            print(f"❌ Erro ao procurar resposta: {e}")
+            semelhantes = []
+    score = semelhantes[0][0] if semelhantes else None
+    resposta_memoria = escolher_resposta(semelhantes, limite_conf)
+    if resposta_memoria:
+        guardar(perfil["nome"], pergunta_l, resposta_memoria, perfil, contexto=intencao, vetor=vetor)
+        estado["ultimo_contexto"] = intencao
+        return resposta_memoria, intencao, "semantica", score
+
+    # 2️⃣ — Regras fixas
+    resposta_regra, contexto = regras_fallback(pergunta_l, event, correspondencias)
+    if resposta_regra:
+        guardar(perfil["nome"], pergunta_l, resposta_regra, perfil, contexto, vetor=vetor)
+        estado["ultimo_contexto"] = contexto
+        return resposta_regra, contexto, "regras", score
+
+    # 3️⃣ — Perguntas sobre confirmações
+    if correspondencias.tem("quem_confirmou") and not correspondencias.tem("futebol"):
+        confirmados = listar_confirmados()
+        estado["ultimo_contexto"] = "confirmacoes"
+
+        if confirmados:
+            lista = ", ".join(confirmados)
+            resposta = f"Até agora confirmaram: {lista} 🎉"
+        else:
+            resposta = f"Ainda ninguém confirmou oficialmente 😅 E tu, {perfil['nome']}, já confirmaste?"
+
+        guardar(perfil["nome"], pergunta_l, resposta, perfil, contexto="confirmacoes", vetor=vetor)
+        return resposta, "confirmacoes", "quem_confirmou", score
+
+    # 4️⃣ — Saudações
+    if correspondencias.tem("saudacao"):
+        respostas = [
+            f"Olá, {perfil['nome']}! Pronto para a festa? 🎉",
+            f"Bom ver-te, {perfil['nome']}! Já cheira a champanhe 🍾",
+            f"Ei, {perfil['nome']}! Está quase na hora do brinde 🥂",
+            f"Olá, {perfil['nome']}! O Diácono está pronto 🙏✨",
+        ]
+        resposta = random.choice(respostas)
+        guardar(perfil["nome"], pergunta_l, resposta, perfil, contexto="saudacao", vetor=vetor)
+        estado["ultimo_contexto"] = "saudacao"
+        return resposta, "saudacao", "saudacao", score
+
+    # 5️⃣ — Fallback geral
+    respostas_default = [
+        "Vai ser uma noite épica 🎉",
+        "Só posso dizer que vai haver surpresas 😉",
+        "Não revelo tudo, mas vai ser memorável 🎆",
+        "A festa promete... mas não posso dar spoilers 😏",
+    ]
+    resposta = random.choice(respostas_default)
+    guardar(perfil["nome"], pergunta_l, resposta, perfil, vetor=vetor)
+    estado["ultimo_contexto"] = "geral"
+    return resposta, "geral", "default", score
+
+def gerar_resposta(pergunta: str, perfil: dict, estado, event: dict, **kwargs):
+    """Resposta final com o tom ajustado ao contexto."""
+    resposta, contexto, _ = responder(pergunta, perfil, estado, event, **kwargs)
+    return ajustar_tom(resposta, contexto, perfil)
+
+# =====================================================
+# 📦 Respostas em lote
+# =====================================================
+def responder_lote(perguntas, perfil: dict, estado=None, event=None,
+                   limite_conf=LIMITE_CONF, top_k=TOP_K, registar=False, tom=True):
+    """
+    Responde a uma lista de perguntas como turnos seguidos da mesma conversa
+    (`estado`, por omissão uma EstadoSessao nova). Por omissão nada é escrito
+    na base. Devolve [{pergunta, resposta, contexto, ramo, score}, ...] pela
+    mesma ordem.
+    """
+    estado = EstadoSessao() if estado is None else estado
+    turnos = [(pergunta, perfil, estado) for pergunta in perguntas]
+    return responder_turnos(turnos, event, limite_conf=limite_conf, top_k=top_k, registar=registar, tom=tom)
+
+def responder_turnos(turnos, event=None, limite_conf=LIMITE_CONF, top_k=TOP_K, registar=False, tom=True):
+    """
+    Responde a turnos (pergunta, perfil, estado), possivelmente de conversas
+    diferentes. O trabalho pesado é feito uma vez para o lote: um só encode
+    para todas as perguntas que não têm resposta exata, as intenções numa só
+    multiplicação e uma única pesquisa (`search_batch` no Qdrant, ou o índice
+    em memória). Depois a cadeia corre turno a turno com esses resultados,
+    pela ordem dada, para o estado de cada conversa evoluir como se as
+    mensagens tivessem chegado uma a uma.
+    """
+    event = carregar_evento() if event is None else event
+    turnos = list(turnos)
+
+    preparados = []
+    for pergunta, _, _ in turnos:
+        pergunta_l = normalizar(pergunta)
+        with medir("regras"):
+            correspondencias = regras_compiladas.avaliar(pergunta_l)
+        preparados.append({
+            "pergunta_l": pergunta_l,
+            "correspondencias": correspondencias,
+            "exata": procurar_resposta_exata(pergunta_l),
+        })
+
+    # As que a resposta exata já resolve não precisam do modelo (salvo se
+    # vierem a ser uma confirmação; nesse caso a cadeia codifica-as sozinha)
+    em_falta = [p for p in preparados if not p["exata"][0]]
+    if em_falta and arranque_concluido():
+        vetores = codificar([p["pergunta_l"] for p in em_falta])
+        intencoes = identificar_intencoes_lote(vetores)
+        try:
+            semelhantes = procurar_semelhantes_lote(vetores, intencoes, top_k=top_k)
+        except Exception as e:
+            print(f"❌ Erro na pesquisa em lote: {e}")
+            semelhantes = [None] * len(em_falta)
+        for p, vetor, intencao, resultado in zip(em_falta, vetores, intencoes, semelhantes):
+            p.update(vetor=vetor, intencao=intencao, semelhantes=resultado)
+
+    respostas = []
+    for (pergunta, perfil, estado), preparado in zip(turnos, preparados):
+        resposta, contexto, ramo, score = _responder_turno(
+            pergunta, perfil, estado, event, limite_conf, top_k, registar, preparado
+        )
+        if tom:
+            resposta = ajustar_tom(resposta, contexto, perfil)
+        respostas.append({"pergunta": pergunta, "resposta": resposta, "contexto": contexto,
+                          "ramo": ramo, "score": score})
+    return respostas
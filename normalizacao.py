@@ -0,0 +1,16 @@
+# normalizacao.py
+import re
+import unicodedata
+
+# =====================================================
+# 🔧 Normalização de texto (partilhada pela app, Qdrant e seeders)
+# =====================================================
+def normalizar(txt: str) -> str:
+    if not isinstance(txt, str):
+        return ""
+    t = txt.lower().strip()
+    t = unicodedata.normalize("NFKD", t)
+    t = "".join(c for c in t if not unicodedata.combining(c))
+    t = re.sub(r"[^\w\s]", " ", t)
+    t = re.sub(r"\s+", " ", t).strip()
+    return t
@@ -0,0 +1,93 @@
+# recursos.py
+import os
+import shutil
+import threading
+
+# =====================================================
+# 🔒 RECURSOS PARTILHADOS POR PROCESSO
+# =====================================================
+# Um único modelo e um único cliente Qdrant por processo, independentemente
+# de quantas sessões Streamlit (threads) ou reruns existirem.
+_registo = {}
+_lock_registo = threading.Lock()  # só protege _locks_criacao
+_locks_criacao = {}               # chave → lock da criação desse recurso
+
+
+class AcessoSeguro:
+    """Proxy que serializa as chamadas a um objeto partilhado entre threads."""
+
+    def __init__(self, alvo):
+        self._alvo = alvo
+        self._lock = threading.RLock()
+
+    def __getattr__(self, nome):
+        atributo = getattr(self._alvo, nome)
+        if not callable(atributo):
+            return atributo
+
+        def chamada(*args, **kwargs):
+            with self._lock:
+                return atributo(*args, **kwargs)
+
+        return chamada
+
+    @property
+    def alvo(self):
+        return self._alvo
+
+
+def obter_recurso(chave, criar):
+    """Devolve o recurso registado em `chave`, criando-o uma única vez."""
+    recurso = _registo.get(chave)
+    if recurso is not None:
+        return recurso
+    with _lock_registo:
+        lock = _locks_criacao.setdefault(chave, threading.Lock())
+    # Um lock por chave: o modelo e o cliente Qdrant são criados em paralelo
+    with lock:
+        if chave not in _registo:
+            _registo[chave] = AcessoSeguro(criar())
+        return _registo[chave]
+
+
+def obter_modelo(nome_modelo):
+    def criar():
+        from sentence_transformers import SentenceTransformer
+
+        print(f"🔧 A inicializar modelo de embeddings: {nome_modelo}")
+        return SentenceTransformer(nome_modelo)
+
+    return obter_recurso(("modelo", nome_modelo), criar)
+
+
+def obter_cliente(path, url=None):
+    """
+    Cliente Qdrant do processo. Com `url` liga a um servidor (vários processos
+    podem partilhá-lo); sem `url` usa o modo local em `path`, que só admite um
+    processo de cada vez por causa do lock de ficheiro.
+    """
+
+    def criar():
+        from qdrant_client import QdrantClient
+
+        if url:
+            return QdrantClient(url=url)
+        try:
+            return QdrantClient(path=path)
+        except RuntimeError as e:
+            if "already accessed" in str(e):
+                # Outro processo tem o lock: apagar a pasta destruiria a base dele
+                raise RuntimeError(
+                    f"A base local '{path}' está em uso por outro processo — usa QDRANT_URL para partilhar um servidor."
+                ) from e
+            print("⚠️ Base corrompida — recriando diretório...")
+            shutil.rmtree(path, ignore_errors=True)
+            os.makedirs(path, exist_ok=True)
+            return QdrantClient(path=path)
+
+    return obter_recurso(("qdrant", url or path), criar)
+
+
+def recursos_carregados():
+    """Chaves dos recursos já criados (útil para diagnóstico)."""
+    return list(_registo.keys())
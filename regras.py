@@ -0,0 +1,127 @@
+# regras.py
+from collections import deque
+
+# =====================================================
+# 📋 TABELA DE REGRAS (declarativa)
+# =====================================================
+# Cada regra dispara se QUALQUER dos padrões aparecer como substring do texto
+# normalizado — a mesma semântica dos antigos `any(p in pergunta_l ...)`.
+# Dentro de um grupo ganha a regra de menor prioridade. Os padrões estão
+# iguais aos originais (incluindo os acentuados, que o texto normalizado
+# nunca contém), para não mudar respostas.
+REGRAS = [
+    # Regras fixas de resposta (regras_fallback), pela ordem em que eram testadas
+    {"nome": "nome_bot", "grupo": "fallback", "prioridade": 1,
+     "padroes": ["como te chamas", "quem es tu", "quem és tu", "qual e o teu nome", "te chamas"]},
+    {"nome": "local", "grupo": "fallback", "prioridade": 2,
+     "padroes": ["onde", "local", "sitio", "morada", "porto", "fica longe", "localizacao"]},
+    {"nome": "hora", "grupo": "fallback", "prioridade": 3,
+     "padroes": ["hora", "quando", "que horas", "a que horas", "quando comeca", "quando começa"]},
+    {"nome": "wifi", "grupo": "fallback", "prioridade": 4,
+     "padroes": ["wifi", "wi fi", "wi-fi", "internet", "rede"]},
+    {"nome": "roupa", "grupo": "fallback", "prioridade": 5,
+     "padroes": ["dress", "roupa", "vestir", "codigo", "cor", "amarelo", "dress code"]},
+    {"nome": "levar", "grupo": "fallback", "prioridade": 6,
+     "padroes": ["o que levar", "o que trazer", "preciso levar", "levar algo"]},
+    # Verificações da cadeia de decisão
+    {"nome": "confirmacao", "grupo": "confirmacao", "prioridade": 1,
+     "padroes": ["confirmo", "confirmar", "eu confirmo", "vou", "sim vou", "claro que vou", "estarei lá",
+                 "lá estarei", "já", "também vou", "tambem vou"]},
+    {"nome": "quem_confirmou", "grupo": "quem_confirmou", "prioridade": 1,
+     "padroes": ["confirmou", "quem vai", "vai à festa", "vai a festa", "quem confirmou"]},
+    {"nome": "futebol", "grupo": "exclusao_futebol", "prioridade": 1,
+     "padroes": ["ganhar", "jogo", "benfica", "porto", "sporting", "resultado"]},
+    {"nome": "saudacao", "grupo": "saudacao", "prioridade": 1,
+     "padroes": ["olá", "ola", "bom dia", "boa tarde", "boa noite", "como estás", "tudo bem"]},
+]
+
+
+# =====================================================
+# 🔎 AHO-CORASICK
+# =====================================================
+class Automato:
+    """
+    Autómato de Aho-Corasick sobre caracteres: uma só passagem pelo texto
+    encontra todas as ocorrências de todos os padrões, qualquer que seja o
+    número de padrões.
+    """
+
+    def __init__(self, padroes):
+        # padroes: iterável de (texto, valor); o valor é devolvido quando o texto aparece
+        self._transicoes = [{}]
+        self._falha = [0]
+        self._saida = [set()]
+        for padrao, valor in padroes:
+            if padrao:
+                self._inserir(padrao, valor)
+        self._ligar_falhas()
+
+    def _inserir(self, padrao, valor):
+        estado = 0
+        for c in padrao:
+            seguinte = self._transicoes[estado].get(c)
+            if seguinte is None:
+                seguinte = len(self._transicoes)
+                self._transicoes[estado][c] = seguinte
+                self._transicoes.append({})
+                self._falha.append(0)
+                self._saida.append(set())
+            estado = seguinte
+        self._saida[estado].add(valor)
+
+    def _ligar_falhas(self):
+        # Os filhos da raiz falham para a raiz; o resto em largura a partir deles
+        fila = deque(self._transicoes[0].values())
+        while fila:
+            estado = fila.popleft()
+            for c, seguinte in self._transicoes[estado].items():
+                fila.append(seguinte)
+                falha = self._falha[estado]
+                while falha and c not in self._transicoes[falha]:
+                    falha = self._falha[falha]
+                self._falha[seguinte] = self._transicoes[falha].get(c, 0)
+                # Quem termina no estado de falha também termina aqui
+                self._saida[seguinte] |= self._saida[self._falha[seguinte]]
+
+    def procurar(self, texto):
+        """Conjunto dos valores de todos os padrões que ocorrem em `texto`."""
+        transicoes, falha, saida = self._transicoes, self._falha, self._saida
+        encontrados = set()
+        estado = 0
+        for c in texto:
+            while estado and c not in transicoes[estado]:
+                estado = falha[estado]
+            estado = transicoes[estado].get(c, 0)
+            if saida[estado]:
+                encontrados |= saida[estado]
+        return encontrados
+
+
+# =====================================================
+# 🧩 CONJUNTO DE REGRAS COMPILADO
+# =====================================================
+class ConjuntoRegras:
+    """Compila a tabela num único autómato; `avaliar` devolve todas as regras que disparam."""
+
+    def __init__(self, regras=REGRAS):
+        self.regras = {r["nome"]: r for r in regras}
+        self._automato = Automato((p, r["nome"]) for r in regras for p in r["padroes"])
+
+    def avaliar(self, texto):
+        """Correspondências do texto: [(prioridade, nome, grupo), ...] ordenadas por prioridade."""
+        return Correspondencias(
+            sorted((self.regras[n]["prioridade"], n, self.regras[n]["grupo"]) for n in self._automato.procurar(texto))
+        )
+
+
+class Correspondencias(list):
+    def grupo(self, grupo):
+        """Nome da regra com menor prioridade que disparou no grupo, ou None."""
+        return next((nome for _, nome, g in self if g == grupo), None)
+
+    def tem(self, nome):
+        return any(n == nome for _, n, _ in self)
+
+
+# Compilado uma vez por processo, ao importar
+regras_compiladas = ConjuntoRegras()
@@ -0,0 +1,64 @@
+# responder_perguntas.py
+# Responde a uma lista de perguntas fora do Streamlit, em lote (um encode e
+# uma pesquisa para todas), como turnos seguidos de uma conversa.
+#   python responder_perguntas.py faq.txt                  (uma pergunta por linha)
+#   python responder_perguntas.py conversa.json --perfil Marina --jsonl respostas.jsonl
+#   cat faq.txt | python responder_perguntas.py -
+# Por omissão nada é escrito na base; --registar grava como a app.
+import sys
+import json
+import argparse
+
+import learning_qdrant as lq
+from motor_respostas import LIMITE_CONF, TOP_K, carregar_evento, carregar_json, responder_lote
+
+PERFIL_OMISSAO = {"nome": "Convidado", "personalidade": "neutro"}
+
+
+def ler_perguntas(path):
+    """Texto com uma pergunta por linha, ou JSON: lista de strings ou {"perguntas": [...]}."""
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8-sig")
+    with f:
+        conteudo = f.read()
+    if path.endswith(".json"):
+        dados = json.loads(conteudo)
+        return list(dados["perguntas"] if isinstance(dados, dict) else dados)
+    return [linha.strip() for linha in conteudo.splitlines() if linha.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Responde a perguntas em lote, sem a interface.")
+    parser.add_argument("entrada", help="ficheiro .txt/.json com as perguntas, ou - para stdin")
+    parser.add_argument("--perfil", help="nome de um perfil de profiles.json")
+    parser.add_argument("--limite-conf", type=float, default=LIMITE_CONF)
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    parser.add_argument("--registar", action="store_true", help="grava mensagens e confirmações na base")
+    parser.add_argument("--jsonl", help="grava as respostas neste ficheiro (uma por linha)")
+    args = parser.parse_args()
+
+    perfil = PERFIL_OMISSAO
+    if args.perfil:
+        perfis = {p["nome"]: p for p in carregar_json("profiles.json", default=[])}
+        if args.perfil not in perfis:
+            parser.error(f"perfil '{args.perfil}' não existe em profiles.json")
+        perfil = perfis[args.perfil]
+
+    perguntas = ler_perguntas(args.entrada)
+    lq.esperar_arranque()
+
+    respostas = responder_lote(perguntas, perfil, event=carregar_evento(),
+                               limite_conf=args.limite_conf, top_k=args.top_k, registar=args.registar)
+
+    for r in respostas:
+        score = "—" if r["score"] is None else f"{r['score']:.2f}"
+        print(f"❓ {r['pergunta']}\n   [{r['ramo']} · {r['contexto']} · {score}] {r['resposta']}")
+
+    if args.jsonl:
+        with open(args.jsonl, "w", encoding="utf-8") as f:
+            for r in respostas:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        print(f"\n💾 {len(respostas)} respostas em {args.jsonl}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+# servico.py
+# Serviço HTTP/WebSocket (ASGI, sem framework) à volta da cadeia de resposta,
+# para muitos convidados em simultâneo. Pedidos que chegam com poucos ms de
+# diferença são juntados num só lote: um encode e uma pesquisa para todos.
+#   uvicorn servico:app --host 0.0.0.0 --port 8000
+#   python servico.py --porta 8000
+#
+#   POST /responder   {"pergunta": "...", "nome": "Marina", "sessao": "abc"}
+#                     → {"resposta", "contexto", "ramo", "score"}
+#                     (como na app, "nome" tem de ser um dos perfis de profiles.json)
+#   WS   /ws          uma mensagem JSON como a do POST por turno
+#   GET  /saude       arranque e tamanho da fila
+#   GET  /metrics     Prometheus (e /metricas.json)
+#
+# Afinação: CHATBOT_LOTE_MAX, CHATBOT_LOTE_ESPERA_MS, CHATBOT_FILA_MAX.
+# Com a fila cheia os pedidos são recusados logo (503 + Retry-After).
+import os
+import json
+import time
+import uuid
+import asyncio
+import argparse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import metricas
+from evento import carregar_evento, carregar_json
+from motor_respostas import EstadoSessao, responder_turnos
+from learning_qdrant import arranque_concluido
+
+LOTE_MAX = int(os.environ.get("CHATBOT_LOTE_MAX", 32))
+LOTE_ESPERA_MS = float(os.environ.get("CHATBOT_LOTE_ESPERA_MS", 5))
+FILA_MAX = int(os.environ.get("CHATBOT_FILA_MAX", 256))
+SESSOES_MAX = int(os.environ.get("CHATBOT_SESSOES_MAX", 10_000))
+CORPO_MAX = 16 * 1024  # bytes de um pedido
+
+class Sobrecarga(Exception):
+    """A fila de pedidos está cheia."""
+
+
+# =====================================================
+# 🗂️ SESSÕES
+# =====================================================
+class Sessoes:
+    """
+    EstadoSessao por id de sessão; acima de `maximo` esquece as menos usadas.
+    Só é usada pela thread que processa os lotes, por isso não tem lock.
+    """
+
+    def __init__(self, maximo=SESSOES_MAX):
+        self.maximo = maximo
+        self._estados = OrderedDict()
+
+    def __len__(self):
+        return len(self._estados)
+
+    def obter(self, sessao_id):
+        if not sessao_id:
+            return EstadoSessao()
+        estado = self._estados.get(sessao_id)
+        if estado is None:
+            estado = self._estados[sessao_id] = EstadoSessao()
+            if len(self._estados) > self.maximo:
+                self._estados.popitem(last=False)
+        else:
+            self._estados.move_to_end(sessao_id)
+        return estado
+
+
+# =====================================================
+# 📦 MICRO-LOTES
+# =====================================================
+class AgregadorLotes:
+    """
+    Junta os pedidos que chegam enquanto o lote anterior é processado, ou
+    durante `espera_ms` depois do primeiro, até `lote_max`. `processar(itens)`
+    é síncrono (modelo e Qdrant bloqueiam) e corre numa thread dedicada, um
+    lote de cada vez; a fila tem `fila_max` lugares e, cheia, recusa pedidos.
+    """
+
+    def __init__(self, processar, lote_max=LOTE_MAX, espera_ms=LOTE_ESPERA_MS, fila_max=FILA_MAX):
+        self.processar = processar
+        self.lote_max = lote_max
+        self.espera_ms = espera_ms
+        self.fila_max = fila_max
+        self.fila = None
+        self._tarefa = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lotes")
+        self.estatisticas = {"pedidos": 0, "lotes": 0, "rejeitados": 0, "maior_lote": 0}
+
+    def iniciar(self):
+        if self._tarefa is None:
+            self.fila = asyncio.Queue(maxsize=self.fila_max)
+            self._tarefa = asyncio.get_running_loop().create_task(self._ciclo())
+
+    async def parar(self):
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    def pendentes(self):
+        return self.fila.qsize() if self.fila is not None else 0
+
+    async def submeter(self, item):
+        """Resultado de `processar` para `item`; Sobrecarga se a fila estiver cheia."""
+        self.iniciar()
+        futuro = asyncio.get_running_loop().create_future()
+        try:
+            self.fila.put_nowait((item, futuro, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.estatisticas["rejeitados"] += 1
+            raise Sobrecarga()
+        return await futuro
+
+    async def _juntar(self):
+        loop = asyncio.get_running_loop()
+        lote = [await self.fila.get()]
+        limite = loop.time() + self.espera_ms / 1000
+        while len(lote) < self.lote_max:
+            restante = limite - loop.time()
+            try:
+                if restante <= 0:
+                    lote.append(self.fila.get_nowait())
+                else:
+                    lote.append(await asyncio.wait_for(self.fila.get(), restante))
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+        return lote
+
+    async def _ciclo(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = await self._juntar()
+            # Pedidos cujo cliente já desistiu não entram no lote
+            lote = [(item, futuro, t0) for item, futuro, t0 in lote if not futuro.cancelled()]
+            if not lote:
+                continue
+            self.estatisticas["pedidos"] += len(lote)
+            self.estatisticas["lotes"] += 1
+            self.estatisticas["maior_lote"] = max(self.estatisticas["maior_lote"], len(lote))
+            if metricas.ATIVO:
+                agora = time.perf_counter()
+                for _, _, t0 in lote:
+                    metricas.observar("servico_fila", (agora - t0) * 1000)
+            try:
+                resultados = await loop.run_in_executor(self._executor, self.processar, [i for i, _, _ in lote])
+            except Exception as e:
+                print(f"❌ Erro ao processar lote de {len(lote)}: {e}")
+                await self._um_a_um(lote)
+                continue
+            for (_, futuro, _), resultado in zip(lote, resultados):
+                if not futuro.done():
+                    futuro.set_result(resultado)
+
+    async def _um_a_um(self, lote):
+        """Depois de um lote falhar: cada pedido sozinho, para o erro ficar só em quem o causou."""
+        loop = asyncio.get_running_loop()
+        for item, futuro, _ in lote:
+            try:
+                resultado = (await loop.run_in_executor(self._executor, self.processar, [item]))[0]
+            except Exception as e:
+                if not futuro.done():
+                    futuro.set_exception(e)
+                continue
+            if not futuro.done():
+                futuro.set_result(resultado)
+
+
+# =====================================================
+# 🧠 LIGAÇÃO À CADEIA DE RESPOSTA
+# =====================================================
+perfis = {p["nome"]: p for p in carregar_json("profiles.json", default=[])}
+event = carregar_evento()
+sessoes = Sessoes()
+
+def _processar(pedidos):
+    turnos = [(p["pergunta"], p["perfil"], sessoes.obter(p.get("sessao"))) for p in pedidos]
+    with metricas.medir("servico_lote"):
+        respostas = responder_turnos(turnos, event, registar=True)
+    return [{k: r[k] for k in ("resposta", "contexto", "ramo", "score")} for r in respostas]
+
+agregador = AgregadorLotes(_processar)
+
+metricas.registar_coletor("servico", lambda: {
+    **agregador.estatisticas, "fila": agregador.pendentes(), "sessoes": len(sessoes),
+})
+
+
+def _validar(dados):
+    """Pedido validado ou uma mensagem de erro (nada com tipo errado chega ao lote)."""
+    if not isinstance(dados, dict):
+        return None, "o corpo tem de ser um objeto JSON"
+    pergunta = dados.get("pergunta")
+    if not isinstance(pergunta, str) or not pergunta.strip():
+        return None, "falta a 'pergunta'"
+    for campo in ("nome", "sessao"):
+        if dados.get(campo) is not None and not isinstance(dados[campo], str):
+            return None, f"'{campo}' tem de ser texto"
+    perfil = dados.get("perfil")
+    if perfil is not None and not (isinstance(perfil, dict) and isinstance(perfil.get("nome", ""), str)):
+        return None, "'perfil' tem de ser um objeto com 'nome' em texto"
+    # Só os convidados de profiles.json (como na app): o perfil vem sempre do
+    # ficheiro, nunca do cliente, senão qualquer um entrava na lista de confirmados
+    nome = dados.get("nome") or (perfil or {}).get("nome")
+    if nome not in perfis:
+        return None, "'nome' tem de ser um dos perfis de profiles.json"
+    return {"pergunta": pergunta, "perfil": perfis[nome], "sessao": dados.get("sessao")}, None
+
+
+# =====================================================
+# 🌐 ASGI
+# =====================================================
+async def _enviar(send, estado, corpo, tipo="application/json; charset=utf-8", cabecalhos=()):
+    if not isinstance(corpo, bytes):
+        corpo = (corpo if isinstance(corpo, str) else json.dumps(corpo, ensure_ascii=False)).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": estado,
+        "headers": [(b"content-type", tipo.encode()), (b"content-length", str(len(corpo)).encode()),
+                    *cabecalhos],
+    })
+    await send({"type": "http.response.body", "body": corpo})
+
+async def _ler_corpo(receive):
+    corpo = b""
+    while True:
+        mensagem = await receive()
+        if mensagem["type"] == "http.disconnect":
+            return None
+        corpo += mensagem.get("body", b"")
+        if len(corpo) > CORPO_MAX:
+            return False
+        if not mensagem.get("more_body"):
+            return corpo
+
+async def _http(scope, receive, send):
+    metodo, caminho = scope["method"], scope["path"]
+
+    if caminho == "/responder":
+        if metodo != "POST":
+            return await _enviar(send, 405, {"erro": "usa POST"}, cabecalhos=[(b"allow", b"POST")])
+        corpo = await _ler_corpo(receive)
+        if corpo is None:
+            return
+        if corpo is False:
+            return await _enviar(send, 413, {"erro": "pedido demasiado grande"})
+        try:
+            pedido, erro = _validar(json.loads(corpo))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            pedido, erro = None, "JSON inválido"
+        if erro:
+            return await _enviar(send, 400, {"erro": erro})
+        try:
+            resultado = await agregador.submeter(pedido)
+        except Sobrecarga:
+            return await _enviar(send, 503, {"erro": "serviço sobrecarregado"}, cabecalhos=[(b"retry-after", b"1")])
+        except Exception:
+            return await _enviar(send, 500, {"erro": "erro interno"})
+        return await _enviar(send, 200, resultado)
+
+    if metodo != "GET":
+        return await _enviar(send, 405, {"erro": "método não suportado"})
+    if caminho == "/saude":
+        return await _enviar(send, 200, {"pronto": arranque_concluido(), "fila": agregador.pendentes()})
+    if caminho == "/metrics":
+        return await _enviar(send, 200, metricas.exportar_prometheus(), "text/plain; version=0.0.4; charset=utf-8")
+    if caminho == "/metricas.json":
+        return await _enviar(send, 200, metricas.exportar_json())
+    return await _enviar(send, 404, {"erro": "não encontrado"})
+
+async def _websocket(scope, receive, send):
+    if scope["path"] != "/ws":
+        await send({"type": "websocket.close", "code": 1008})
+        return
+    # Sem "sessao" nas mensagens, a ligação é a sessão
+    sessao_ligacao = uuid.uuid4().hex
+    while True:
+        mensagem = await receive()
+        if mensagem["type"] == "websocket.connect":
+            await send({"type": "websocket.accept"})
+            continue
+        if mensagem["type"] == "websocket.disconnect":
+            return
+        texto = mensagem.get("text") or (mensagem.get("bytes") or b"").decode("utf-8", "replace")
+        try:
+            pedido, erro = _validar(json.loads(texto))
+        except json.JSONDecodeError:
+            pedido, erro = None, "JSON inválido"
+        if erro:
+            resposta = {"erro": erro}
+        else:
+            pedido.setdefault("sessao", sessao_ligacao)
+            try:
+                resposta = await agregador.submeter(pedido)
+            except Sobrecarga:
+                resposta = {"erro": "serviço sobrecarregado"}
+            except Exception:
+                resposta = {"erro": "erro interno"}
+        await send({"type": "websocket.send", "text": json.dumps(resposta, ensure_ascii=False)})
+
+async def _lifespan(receive, send):
+    while True:
+        mensagem = await receive()
+        if mensagem["type"] == "lifespan.startup":
+            agregador.iniciar()
+            await send({"type": "lifespan.startup.complete"})
+        elif mensagem["type"] == "lifespan.shutdown":
+            await agregador.parar()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+async def app(scope, receive, send):
+    if scope["type"] == "http":
+        await _http(scope, receive, send)
+    elif scope["type"] == "websocket":
+        await _websocket(scope, receive, send)
+    elif scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço HTTP/WebSocket do assistente.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--porta", type=int, default=int(os.environ.get("CHATBOT_SERVICO_PORTA", 8000)))
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.porta, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
-﻿from qdrant_client import QdrantClient, models
+﻿from qdrant_client import QdrantClient
+from confirmacoes import RegistoConfirmacoes
 
 QDRANT_PATH = "qdrant_data"
 COLLECTION_NAME = "chatbot_passagem_ano"
@@ -10,19 +11,13 @@ client = QdrantClient(path=QDRANT_PATH)
 info = client.get_collection(COLLECTION_NAME)
 print(f"📊 Vetores armazenados: {info.points_count}\n")
 
-# Pesquisa apenas confirmações
-resultados = client.scroll(
-    collection_name=COLLECTION_NAME,
-    scroll_filter=models.Filter(
-        must=[models.FieldCondition(key="contexto", match=models.MatchValue(value="confirmacoes"))]
-    ),
-    limit=200,
-)
+# Confirmações (coleção própria, um ponto por utilizador)
+registo = RegistoConfirmacoes(client, colecao_legado=COLLECTION_NAME)
+confirmados = registo.confirmados()
 
 print("✅ Confirmações encontradas:\n")
-if not resultados[0]:
+if not confirmados:
     print("⚠️ Nenhuma confirmação registada.")
 else:
-    for ponto in resultados[0]:
-        payload = ponto.payload
-        print(f"🧍 {payload.get('user')} → {payload.get('resposta')}")
+    for nome in confirmados:
+        print(f"🧍 {nome} → {nome} confirmou presença 🎉")
@@ -0,0 +1,127 @@
+# verificar_regras.py
+# Equivalência entre as regras compiladas (regras.py, Aho-Corasick) e as
+# verificações `any(p in pergunta_l ...)` da versão original da app, em
+# mensagens geradas ao acaso. Compara, para cada mensagem, a regra de
+# fallback escolhida (a primeira pela ordem em que eram testadas), a
+# confirmação, o "quem vai" (sem futebol) e a saudação. Sai com código 1 se
+# alguma mensagem divergir.
+#   python verificar_regras.py
+#   python verificar_regras.py --mensagens 20000 --semente 7
+import os
+import sys
+import glob
+import random
+import argparse
+
+from regras import REGRAS, regras_compiladas
+from ingestao import carregar_dataset, pares_do_dataset
+from normalizacao import normalizar
+
+
+# =====================================================
+# 📜 VERSÃO ORIGINAL (copiada da app, pela mesma ordem)
+# =====================================================
+def regras_fallback_original(pergunta_l):
+    if any(p in pergunta_l for p in ["como te chamas", "quem es tu", "quem és tu", "qual e o teu nome", "te chamas"]):
+        return "nome_bot"
+    if any(p in pergunta_l for p in ["onde", "local", "sitio", "morada", "porto", "fica longe", "localizacao"]):
+        return "local"
+    if any(p in pergunta_l for p in ["hora", "quando", "que horas", "a que horas", "quando comeca", "quando começa"]):
+        return "hora"
+    if any(p in pergunta_l for p in ["wifi", "wi fi", "wi-fi", "internet", "rede"]):
+        return "wifi"
+    if any(p in pergunta_l for p in ["dress", "roupa", "vestir", "codigo", "cor", "amarelo", "dress code"]):
+        return "roupa"
+    if any(p in pergunta_l for p in ["o que levar", "o que trazer", "preciso levar", "levar algo"]):
+        return "levar"
+    return None
+
+
+def decisoes_original(pergunta_l):
+    return (
+        regras_fallback_original(pergunta_l),
+        any(t in pergunta_l for t in ["confirmo", "confirmar", "eu confirmo", "vou", "sim vou", "claro que vou",
+                                      "estarei lá", "lá estarei", "já", "também vou", "tambem vou"]),
+        any(p in pergunta_l for p in ["confirmou", "quem vai", "vai à festa", "vai a festa", "quem confirmou"])
+        and not any(p in pergunta_l for p in ["ganhar", "jogo", "benfica", "porto", "sporting", "resultado"]),
+        any(t in pergunta_l for t in ["olá", "ola", "bom dia", "boa tarde", "boa noite", "como estás", "tudo bem"]),
+    )
+
+
+def decisoes_compiladas(pergunta_l):
+    c = regras_compiladas.avaliar(pergunta_l)
+    return c.grupo("fallback"), c.tem("confirmacao"), c.tem("quem_confirmou") and not c.tem("futebol"), c.tem("saudacao")
+
+
+# =====================================================
+# 🎲 MENSAGENS AO ACASO
+# =====================================================
+def fragmentos():
+    """Padrões das regras, perguntas dos datasets e as suas palavras."""
+    padroes = [p for r in REGRAS for p in r["padroes"]]
+    perguntas = []
+    for path in sorted(glob.glob(os.path.join("dados", "*.json"))):
+        perguntas.extend(q for q, _, _ in pares_do_dataset(carregar_dataset(path)))
+    palavras = sorted({p for q in perguntas + padroes for p in q.split()})
+    return padroes, perguntas, palavras
+
+
+def mensagem(rng, padroes, perguntas, palavras):
+    """1 a 4 pedaços (padrões, perguntas, palavras) com gralhas, pontuação e maiúsculas pelo meio."""
+    partes = []
+    for _ in range(rng.randint(1, 4)):
+        fonte = rng.random()
+        if fonte < 0.4:
+            partes.append(rng.choice(padroes))
+        elif fonte < 0.6 and perguntas:
+            partes.append(rng.choice(perguntas))
+        else:
+            partes.append(" ".join(rng.choice(palavras) for _ in range(rng.randint(1, 3))))
+    texto = rng.choice([" ", "", ", ", "? ", "!"]).join(partes)
+    chars = list(texto)
+    for _ in range(rng.randint(0, 3)):
+        if not chars:
+            break
+        i = rng.randrange(len(chars))
+        operacao = rng.random()
+        if operacao < 0.4:
+            chars[i] = rng.choice("abcdefghijklmnopqrstuvwxyzáàãâéêíóõôúç -?!.")
+        elif operacao < 0.7:
+            del chars[i]
+        else:
+            chars[i] = chars[i].upper()
+    return "".join(chars)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mensagens", type=int, default=5000)
+    parser.add_argument("--semente", type=int, default=2024)
+    parser.add_argument("--mostrar", type=int, default=10, help="quantas divergências imprimir")
+    args = parser.parse_args()
+
+    rng = random.Random(args.semente)
+    padroes, perguntas, palavras = fragmentos()
+    divergencias = []
+    disparos = 0
+    for _ in range(args.mensagens):
+        bruta = mensagem(rng, padroes, perguntas, palavras)
+        # A cadeia recebe o texto normalizado; o bruto exercita os padrões acentuados
+        for texto in (normalizar(bruta), bruta):
+            esperado, obtido = decisoes_original(texto), decisoes_compiladas(texto)
+            disparos += any(esperado)
+            if esperado != obtido:
+                divergencias.append((texto, esperado, obtido))
+
+    total = 2 * args.mensagens
+    print(f"📋 {total} textos ({args.mensagens} mensagens, normalizadas e em bruto), {disparos} com alguma regra.")
+    for texto, esperado, obtido in divergencias[:args.mostrar]:
+        print(f"❌ {texto!r}\n   original:   {esperado}\n   compiladas: {obtido}")
+    if divergencias:
+        print(f"❌ {len(divergencias)} divergências.")
+        sys.exit(1)
+    print("✅ Regras compiladas equivalentes às originais.")
+
+
+if __name__ == "__main__":
+    main()